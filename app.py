@@ -1,13 +1,21 @@
 import streamlit as st
 from streamlit_option_menu import option_menu
+import gc
 import json
+import hashlib
 import os
+import re
+import tempfile
+from functools import lru_cache
 from datetime import datetime
-from modules.resume_generator import ResumeGenerator
-from modules.resume_preview import ResumePreview
-from modules.llm_job_analyzer import LLMJobAnalyzer
-from modules.database_manager import db_manager
-from modules.job_storage_service import job_storage
+from modules.database_manager import create_db_manager
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
 
 # Page config
 st.set_page_config(
@@ -17,7 +25,18 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Initialize session state
+# Objects created while the server starts up (imported modules, caches) live
+# for the whole process; move them out of the collector's view once so the
+# garbage collections triggered by each rerun's allocations don't rescan them
+@st.cache_resource
+def _freeze_startup_objects():
+    gc.collect()
+    gc.freeze()
+    return True
+
+_freeze_startup_objects()
+
+# Initialize session state; profile_data is filled from disk by _get_profile
 if 'profile_data' not in st.session_state:
     st.session_state.profile_data = {}
 
@@ -28,30 +47,544 @@ if 'selected_page' not in st.session_state:
     st.session_state.selected_page = "Dashboard"
 
 # Initialize components
+# Heavy modules (ReportLab, python-docx, LLM clients) are imported on first use
+# so pages that never need them don't pay the import cost
 @st.cache_resource
 def get_resume_generator():
+    from modules.resume_generator import ResumeGenerator
     return ResumeGenerator()
 
 @st.cache_resource
 def get_resume_preview():
+    from modules.resume_preview import ResumePreview
     return ResumePreview()
 
 @st.cache_resource
 def get_job_analyzer():
+    from modules.llm_job_analyzer import LLMJobAnalyzer
     return LLMJobAnalyzer()
 
+# Background worker for I/O that can overlap with rendering work (e.g. DB saves)
+@st.cache_resource
+def get_executor():
+    from concurrent.futures import ThreadPoolExecutor
+    return ThreadPoolExecutor(max_workers=4)
+
+# Database connections are shared across sessions and survive reruns
+@st.cache_resource
+def get_db_manager():
+    return create_db_manager()
+
+@st.cache_resource
+def get_job_storage():
+    from modules.job_storage_service import JobAnalysisStorage
+    return JobAnalysisStorage(get_db_manager())
+
+db_manager = get_db_manager()
+
+@st.cache_data(ttl=60, max_entries=8, show_spinner=False)
+def _analysis_stats(db_type, stats_token):
+    """Job History summary stats, keyed on the active database and its stats token"""
+    return get_job_storage().get_analysis_stats()
+
+@st.cache_data(ttl=60, max_entries=64, show_spinner=False)
+def _company_suggestions(db_type, stats_token, prefix):
+    """Company filter options matching the typed prefix"""
+    return get_job_storage().autocomplete_companies(prefix, limit=20)
+
+@st.cache_data(ttl=10, show_spinner=False)
+def _db_status():
+    """Connection status for display; cleared whenever the database config changes"""
+    return get_db_manager().get_database_info()
+
+# ReportLab/python-docx rendering is CPU-bound; run it in worker processes so
+# one user's export doesn't hold the GIL that every other session shares.
+# Workers are spawned rather than forked: forking the multi-threaded server
+# (tornado loop, pymongo monitors, open SQLite connection) can deadlock
+@st.cache_resource
+def get_render_pool():
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+    return ProcessPoolExecutor(max_workers=2, mp_context=multiprocessing.get_context("spawn"))
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def _render_resume(format_choice, profile, job_analysis):
+    """Render the resume document once per profile/analysis/format combination"""
+    from concurrent.futures.process import BrokenProcessPool
+    from modules.resume_generator import render_resume
+    try:
+        return get_render_pool().submit(render_resume, profile, job_analysis, format_choice).result()
+    except BrokenProcessPool:
+        # A worker died (e.g. killed for memory); replace the pool and retry once
+        get_render_pool.clear()
+        return get_render_pool().submit(render_resume, profile, job_analysis, format_choice).result()
+
+@st.cache_data(max_entries=4, show_spinner=False)
+def _render_preview(comparison, profile, job_analysis, original_skills, tailored_skills, prioritized_experiences):
+    """Render the tailored preview; cached runs replay the recorded elements"""
+    generator = get_resume_generator()
+    preview = get_resume_preview()
+    if comparison:
+        preview.show_comparison(
+            profile, job_analysis, generator,
+            original_skills=original_skills,
+            tailored_skills=tailored_skills,
+            prioritized_experiences=prioritized_experiences
+        )
+    else:
+        preview.display_preview(
+            profile, job_analysis, generator,
+            tailored_skills=tailored_skills,
+            prioritized_experiences=prioritized_experiences
+        )
+
+@st.fragment
+def _download_panel(profile, job_analysis):
+    """Format picker and download button. Runs as a fragment, so switching
+    format or generating a file doesn't rerun the preview below it."""
+    col1, col2 = st.columns([1, 2])
+    with col1:
+        format_choice = st.selectbox("Format", ["PDF", "Word Document"])
+    
+    with col2:
+        st.write("")  # Align the button with the selectbox input
+        generate = st.button("📥 Generate & Download Resume", type="primary", use_container_width=True)
+    
+    # One stable slot for the download button; the generated file is kept in
+    # session state so reruns redraw the same widget instead of a new one
+    download_slot = st.empty()
+    source = (
+        profile.get('last_updated'),
+        (st.session_state.get('tailored_resume') or {}).get('timestamp'),
+        format_choice
+    )
+    
+    if generate:
+        try:
+            with st.spinner(f"Generating {format_choice.lower()}..."):
+                data = _render_resume(format_choice, profile, job_analysis)
+            
+            if format_choice == "PDF":
+                filename = "resume_tailored.pdf"
+                mime_type = "application/pdf"
+            else:  # Word Document
+                filename = "resume_tailored.docx"
+                mime_type = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+            
+            st.session_state.resume_download = {
+                'source': source,
+                'data': data,
+                'file_name': filename,
+                'mime': mime_type
+            }
+            
+        except Exception as e:
+            st.error(f"Error generating {format_choice.lower()}: {str(e)}")
+    
+    download = st.session_state.get('resume_download')
+    if download is not None and download['source'] == source:
+        download_slot.download_button(
+            label=f"📥 Download {format_choice}",
+            data=download['data'],
+            file_name=download['file_name'],
+            mime=download['mime'],
+            type="primary",
+            use_container_width=True,
+            key="dl_stable"
+        )
+
+@st.fragment
+def _history_results(job_storage, db_type, stats_token, exp_levels):
+    """Job History search, filters and results. Runs as a fragment, so typing
+    a search or changing a filter doesn't rerun the stats above it."""
+    # Search and filters
+    col1, col2 = st.columns([2, 1])
+    with col1:
+        search_term = st.text_input("🔍 Search job analyses", placeholder="Search by job title, company, or skills...")
+    with col2:
+        limit = st.selectbox("Page size", [10, 20, 50], index=1)
+    
+    # Filter options
+    with st.expander("🎯 Advanced Filters"):
+        filter_col1, filter_col2 = st.columns(2)
+        with filter_col1:
+            company_prefix = st.text_input("Company (type to filter)")
+            companies = _company_suggestions(db_type, stats_token, company_prefix.strip())
+            selected_company = st.selectbox("Company", ["All"] + companies, index=0)
+        with filter_col2:
+            selected_exp_level = st.selectbox("Experience Level", ["All"] + exp_levels, index=0)
+    
+    # Get job analyses a page at a time. Pages are kept in session state and
+    # "Load more" continues from the last row's cursor, so earlier pages are
+    # never re-read; changing the search or filters, switching databases, or
+    # analyses being added or deleted (the stats token) starts over
+    company_filter = None if selected_company == "All" else selected_company
+    exp_level_filter = None if selected_exp_level == "All" else selected_exp_level
+    page_query = (db_type, stats_token, search_term, company_filter, exp_level_filter, limit)
+    
+    def fetch_page(after=None):
+        fields = job_storage.LIST_FIELDS
+        if search_term:
+            return job_storage.search_analyses(search_term, limit=limit, after=after, fields=fields)
+        return job_storage.get_job_analyses(
+            limit=limit, 
+            company=company_filter, 
+            experience_level=exp_level_filter,
+            after=after,
+            fields=fields
+        )
+    
+    if st.session_state.get('analyses_query') != page_query:
+        page = fetch_page()
+        st.session_state.analyses_query = page_query
+        st.session_state.analyses_page = page
+        st.session_state.analyses_has_more = len(page) >= limit
+    analyses = st.session_state.analyses_page
+    
+    if analyses:
+        st.subheader(f"📋 Found {len(analyses)} job analyses")
+        
+        for i, analysis in enumerate(analyses):
+            with st.expander(f"#{i+1} {analysis.get('job_title', 'Unknown Position')} @ {analysis.get('company', 'Unknown Company')}", expanded=False):
+                col1, col2 = st.columns([2, 1])
+                
+                with col1:
+                    st.write(f"**Job Title:** {analysis.get('job_title', 'N/A')}")
+                    st.write(f"**Company:** {analysis.get('company', 'N/A')}")
+                    st.write(f"**Experience Level:** {analysis.get('experience_level', 'N/A').title()}")
+                    st.write(f"**Skills Count:** {analysis.get('skills_count', 0)}")
+                    
+                    # Show top skills
+                    analysis_data = analysis.get('analysis', {})
+                    technical_skills = analysis_data.get('technical_skills', [])[:5]
+                    if technical_skills:
+                        st.write(f"**Top Skills:** {', '.join(technical_skills)}")
+                
+                with col2:
+                    created_at = analysis.get('created_at', '')
+                    if created_at:
+                        st.write(f"**Analyzed:** {_format_timestamp(created_at)}")
+                    
+                    # Mark for deletion; selected rows are removed in one batch below
+                    st.checkbox("🗑️ Select for deletion", key=f"select_{analysis['_id']}")
+                
+                # Job description preview, only built for rows where it was asked for
+                if st.toggle("📄 Show job description", key=f"open_{analysis['_id']}"):
+                    job_desc = analysis.get('job_description_preview')
+                    truncated = analysis.get('job_description_length', 0) > len(job_desc or '')
+                    # Analyses saved before previews were stored only have the full text
+                    if job_desc is None or (truncated and st.checkbox("Show full description", key=f"full_{analysis['_id']}")):
+                        job_desc = (job_storage.get_job_analysis(analysis['_id']) or {}).get('job_description', '')
+                        truncated = False
+                    st.text_area("", value=job_desc + "..." if truncated else job_desc, height=100, disabled=True, key=f"desc_{analysis['_id']}")
+        
+        selected_ids = [a['_id'] for a in analyses if st.session_state.get(f"select_{a['_id']}")]
+        if selected_ids:
+            if st.button(f"🗑️ Delete selected ({len(selected_ids)})", type="primary"):
+                deleted = job_storage.delete_job_analyses(selected_ids)
+                if deleted:
+                    # Drop the rows locally and move the cached query onto the
+                    # post-delete stats token, so the loaded pages (including
+                    # "Load more" ones) are kept instead of re-fetched
+                    removed = set(selected_ids)
+                    analyses[:] = [a for a in analyses if a['_id'] not in removed]
+                    st.session_state.analyses_query = (db_type, job_storage.get_stats_token(), *page_query[2:])
+                    _clear_widget_state("select_")
+                    st.rerun()  # Full rerun so the stats pick up the deletion
+                else:
+                    st.error("Failed to delete the selected analyses")
+        
+        if st.session_state.analyses_has_more:
+            if st.button("⬇️ Load more", use_container_width=True):
+                page = fetch_page(after=job_storage.page_cursor(analyses))
+                analyses.extend(page)
+                st.session_state.analyses_has_more = len(page) >= limit
+                st.rerun(scope="fragment")
+    else:
+        st.info("🔍 No job analyses found. Start by analyzing some job descriptions!")
+        if st.button("📝 Analyze Your First Job"):
+            st.session_state.selected_page = "Export Resume"
+            st.rerun()
+
+def _tailoring_display(analysis):
+    """Display-ready summary of a job analysis for the Tailoring Details expander"""
+    # Priority skills come as dicts from the LLM analyzer and as strings otherwise
+    skill_names = [
+        s.get('skill', str(s)) if isinstance(s, dict) else str(s)
+        for s in analysis.get('priority_skills', [])[:5]
+    ]
+    return {
+        'priority_skills': ', '.join(skill_names),
+        'experience_level': analysis.get('experience_level', 'Unknown').title(),
+        'requirements_count': len(analysis.get('requirements', [])),
+        'technical_skills_count': len(analysis.get('technical_skills', []))
+    }
+
+def _jd_digest(job_description):
+    # Whitespace-only edits (re-pasting, trailing newlines) shouldn't miss the cache
+    normalized = ' '.join(job_description.split())
+    return hashlib.blake2b(normalized.encode(), digest_size=16).hexdigest()
+
+@st.cache_data(ttl=24 * 3600, max_entries=128, show_spinner=False)
+def _analyze_job_cached(jd_digest, _job_description):
+    """Analyze a job description, reusing results for repeated descriptions.
+    Failures raise, so a fallback analysis is never cached."""
+    return get_job_analyzer().analyze_job_description(_job_description, fallback=False)
+
+def _analyze_job(job_description):
+    """Cached analysis, falling back to the basic (uncached) analysis on errors"""
+    try:
+        return _analyze_job_cached(_jd_digest(job_description), job_description)
+    except Exception as e:
+        st.error(f"Error in job analysis: {str(e)}")
+        return get_job_analyzer()._fallback_analysis(job_description)
+
+def _analysis_digest(analysis):
+    # Identifies the analysis content itself, so a re-analyzed description never
+    # reuses a score computed from an older (or fallback) analysis
+    return hashlib.blake2b(_json_dumps(analysis, sort_keys=True), digest_size=16).hexdigest()
+
+@st.cache_data(ttl=24 * 3600, max_entries=128, show_spinner=False)
+def _match_score_cached(analysis_digest, skills, _analysis):
+    """Match score of the given skills against an analysis; analysis_digest identifies it.
+    Failures raise, so a fallback score is never cached."""
+    return get_job_analyzer().calculate_match_score(list(skills), _analysis, fallback=False)
+
+def _match_score(skills, analysis):
+    """Cached match score, falling back to the simple (uncached) overlap score on errors"""
+    try:
+        return _match_score_cached(_analysis_digest(analysis), skills, analysis)
+    except Exception as e:
+        st.warning(f"Error calculating LLM match score, using fallback: {str(e)}")
+        return get_job_analyzer()._fallback_match_score(list(skills), analysis)
+
+def _now_iso():
+    # User-visible timestamps only; seconds precision is all the UI shows
+    return datetime.now().isoformat(timespec='seconds')
+
+@lru_cache(maxsize=1024)
+def _format_timestamp(value):
+    """Format a stored ISO timestamp for display, falling back to the raw value"""
+    try:
+        return datetime.fromisoformat(value).strftime('%Y-%m-%d %H:%M')
+    except (TypeError, ValueError):
+        return value
+
 # Load profile data if exists
 PROFILE_FILE = 'profile_data.json'
 
+# Profile skill fields, in display order
+_SKILL_CATEGORIES = ('programming_skills', 'technologies', 'language_skills', 'certifications')
+_SKILLS_CATEGORY_DISPLAY = (
+    ('Programming Skills', 'programming_skills'),
+    ('Technologies & Tools', 'technologies'),
+    ('Language Skills', 'language_skills'),
+    ('Certifications', 'certifications')
+)
+
+# Free-text profile fields edited in the Edit Profile form, in save order
+_PROFILE_TEXT_FIELDS = ('name', 'email', 'phone', 'location', 'linkedin', 'website', 'summary') + _SKILL_CATEGORIES
+
+# Skill tag background color per display category
+_COLOR_MAP = {
+    'Programming Skills': '#e1f5fe',
+    'Technologies & Tools': '#f3e5f5',
+    'Language Skills': '#e8f5e8',
+    'Certifications': '#fff3e0'
+}
+
+def _json_loads(payload):
+    if ORJSON_AVAILABLE:
+        return orjson.loads(payload)
+    return json.loads(payload)
+
+def _json_dumps(data, sort_keys=False):
+    # Both paths produce compact UTF-8 bytes
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data, option=orjson.OPT_SORT_KEYS if sort_keys else None)
+    return json.dumps(data, separators=(',', ':'), ensure_ascii=False, sort_keys=sort_keys).encode('utf-8')
+
+@st.cache_data(show_spinner=False)
+def _load_profile_cached(path, mtime):
+    # mtime is only part of the cache key so edits on disk invalidate the entry
+    with open(path, 'rb') as f:
+        return _json_loads(f.read())
+
+def _profile_mtime():
+    return os.path.getmtime(PROFILE_FILE) if os.path.exists(PROFILE_FILE) else 0
+
 def load_profile():
-    if os.path.exists(PROFILE_FILE):
-        with open(PROFILE_FILE, 'r') as f:
-            return json.load(f)
+    mtime = _profile_mtime()
+    if mtime:
+        return _load_profile_cached(PROFILE_FILE, mtime)
     return {}
 
+def _profile_digest(data):
+    # last_updated changes on every save, so it is left out of the comparison;
+    # keys are sorted so the same profile built in a different order matches
+    content = {k: v for k, v in data.items() if k != 'last_updated'}
+    return hashlib.blake2b(_json_dumps(content, sort_keys=True), digest_size=16).digest()
+
 def save_profile(data):
-    with open(PROFILE_FILE, 'w') as f:
-        json.dump(data, f, indent=2)
+    """Write the profile to disk. Returns False if nothing changed since the last save."""
+    digest = _profile_digest(data)
+    if '_profile_mtime' in st.session_state and os.path.exists(PROFILE_FILE):
+        previous = st.session_state.get('_profile_digest')
+        if previous is None:
+            previous = _profile_digest(st.session_state.profile_data)
+        if digest == previous:
+            st.session_state._profile_digest = digest
+            return False
+    
+    data = {**data, 'last_updated': _now_iso()}
+    # Serialize up front so the file is written with a single call, then swap it
+    # into place atomically so a concurrent rerun never reads a half-written file
+    # (each save gets its own temp file, so concurrent sessions can't collide)
+    payload = _json_dumps(data)
+    with tempfile.NamedTemporaryFile(
+        dir=os.path.dirname(os.path.abspath(PROFILE_FILE)),
+        prefix=os.path.basename(PROFILE_FILE) + '.', suffix='.tmp', delete=False
+    ) as f:
+        f.write(payload)
+    try:
+        os.replace(f.name, PROFILE_FILE)
+    except OSError:
+        os.remove(f.name)
+        raise
+    _load_profile_cached.clear()
+    st.session_state.profile_data = data
+    st.session_state._profile_mtime = _profile_mtime()
+    st.session_state._profile_digest = digest
+    return True
+
+def _clear_widget_state(*prefixes):
+    for key in [k for k in st.session_state if k.startswith(prefixes)]:
+        del st.session_state[key]
+
+def _get_profile():
+    # Keep the profile in session state so interactive reruns only stat the file;
+    # it is re-read only when the file changed outside this session
+    mtime = _profile_mtime()
+    if st.session_state.get('_profile_mtime') != mtime:
+        st.session_state.profile_data = load_profile()
+        st.session_state._profile_mtime = mtime
+        st.session_state.pop('_profile_digest', None)
+        # Drop form state built from the old profile; the Edit tab re-seeds
+        # its fields and rows from the reloaded one
+        st.session_state.pop('temp_experiences', None)
+        st.session_state.pop('temp_education', None)
+        _clear_widget_state("edit_", *(prefix for _, prefix in _EXPERIENCE_FIELDS + _EDUCATION_FIELDS))
+    return st.session_state.profile_data
+
+_SKILL_SPLIT = re.compile(r'\s*,\s*')
+
+@lru_cache(maxsize=64)
+def _parse_skills(skills_text):
+    """Split a comma-separated skills string into a tuple of trimmed skills"""
+    if not skills_text:
+        return ()
+    return tuple(t for t in _SKILL_SPLIT.split(skills_text.strip()) if t)
+
+@st.cache_data(show_spinner=False)
+def _all_skills(programming, technologies, languages, certifications):
+    """Flatten the four skill category strings into one tuple of skills"""
+    all_skills = []
+    for skills_text in (programming, technologies, languages, certifications):
+        if skills_text:
+            all_skills.extend(_parse_skills(skills_text))
+    return tuple(all_skills)
+
+@st.cache_data(show_spinner=False)
+def _completeness(has_name, has_email, has_skills):
+    """Percentage of the required profile fields (name, email, skills) filled in"""
+    return (has_name + has_email + has_skills) / 3 * 100
+
+# One stylesheet with a class per category, so each tag span only carries class names
+_SKILL_TAG_CLASSES = {
+    'Programming Skills': 'skill-prog',
+    'Technologies & Tools': 'skill-tech',
+    'Language Skills': 'skill-lang',
+    'Certifications': 'skill-cert'
+}
+_SKILL_TAG_CSS = (
+    '<style>.skill-tag { color: #333; padding: 2px 8px; margin: 2px; border-radius: 12px; font-size: 12px; display: inline-block; }'
+    + ''.join(f' .{_SKILL_TAG_CLASSES[category]} {{ background-color: {color}; }}' for category, color in _COLOR_MAP.items())
+    + '</style>'
+)
+_SKILL_TAG_FMT = '<span class="skill-tag {c}">{s}</span>'
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def _skills_html(category, skills_text):
+    """Render a skills category as a single HTML blob of tag spans"""
+    css_class = _SKILL_TAG_CLASSES.get(category, 'skill-prog')
+    return "".join(_SKILL_TAG_FMT.format(c=css_class, s=skill) for skill in _parse_skills(skills_text))
+
+# Edit Profile row fields as (profile key, widget key prefix) pairs
+_EXPERIENCE_FIELDS = (('title', 'title_'), ('company', 'company_'), ('duration', 'duration_'), ('description', 'desc_'))
+_EDUCATION_FIELDS = (('institution', 'edu_inst_'), ('degree', 'edu_degree_'), ('field', 'edu_field_'),
+                     ('year', 'edu_year_'), ('details', 'edu_details_'))
+
+def _collect_rows(rows, fields):
+    """Read edited rows back from their widget keys"""
+    state = st.session_state
+    return [
+        {name: state.get(f"{prefix}{i}", row.get(name, '')) for name, prefix in fields}
+        for i, row in enumerate(rows)
+    ]
+
+# Edit Profile rows render inside the edit_profile form. Widget keys hold the
+# edits; the Edit tab collects them back into the temp_* lists on every run.
+def _seed_row(i, row, fields):
+    # Widgets read from their keys; only seed keys that aren't set yet
+    for name, prefix in fields:
+        st.session_state.setdefault(f"{prefix}{i}", row.get(name, ''))
+
+def _experience_row(i):
+    exp = st.session_state.temp_experiences[i]
+    _seed_row(i, exp, _EXPERIENCE_FIELDS)
+    with st.expander(f"Experience {i+1}", expanded=True if exp.get('title', '') == '' else False):
+        col1, col2 = st.columns(2)
+        with col1:
+            st.text_input(f"Job Title", key=f"title_{i}")
+            st.text_input(f"Company", key=f"company_{i}")
+        with col2:
+            st.text_input(f"Duration (e.g., Jan 2020 - Dec 2022)", key=f"duration_{i}")
+        
+        st.text_area(f"Job Description", key=f"desc_{i}", height=100,
+                     help="Describe your responsibilities, achievements, and key accomplishments")
+        
+        # Remove experience button
+        if st.form_submit_button(f"🗑️ Remove Experience {i+1}"):
+            del st.session_state.temp_experiences[i]
+            # Rows shift up, so drop stale widget state and let inputs re-seed
+            _clear_widget_state("title_", "company_", "duration_", "desc_")
+            st.rerun()
+
+def _education_row(i):
+    edu = st.session_state.temp_education[i]
+    _seed_row(i, edu, _EDUCATION_FIELDS)
+    with st.expander(f"Education {i+1}", expanded=True if edu.get('institution', '') == '' else False):
+        col1, col2 = st.columns(2)
+        with col1:
+            st.text_input(f"Institution/School", key=f"edu_inst_{i}")
+            st.text_input(f"Degree/Certification", key=f"edu_degree_{i}")
+        with col2:
+            st.text_input(f"Field of Study", key=f"edu_field_{i}")
+            st.text_input(f"Year/Duration (e.g., 2018-2022)", key=f"edu_year_{i}")
+        
+        st.text_area(f"Additional Details", key=f"edu_details_{i}", height=80,
+                     help="GPA, honors, relevant coursework, achievements, etc.")
+        
+        # Remove education button
+        if st.form_submit_button(f"🗑️ Remove Education {i+1}"):
+            del st.session_state.temp_education[i]
+            _clear_widget_state("edu_")
+            st.rerun()
+
+# Navigation menu configuration
+_MENU_OPTIONS = ("Dashboard", "Profile Manager", "Export Resume", "Job History")
+_MENU_ICONS = ("house", "person", "download", "clock-history")
+_MENU_INDEX = {name: i for i, name in enumerate(_MENU_OPTIONS)}
 
 # Main navigation
 with st.sidebar:
@@ -64,7 +597,12 @@ with st.sidebar:
             help="Enter your DeepSeek API key for enhanced job analysis"
         )
         if api_key:
-            os.environ["DEEPSEEK_API_KEY"] = api_key
+            if os.environ.get("DEEPSEEK_API_KEY") != api_key:
+                os.environ["DEEPSEEK_API_KEY"] = api_key
+                # Analyzer, cached analyses and scores were produced with the old key
+                get_job_analyzer.clear()
+                _analyze_job_cached.clear()
+                _match_score_cached.clear()
             st.success("✅ API key configured")
         else:
             st.warning("⚠️ No API key - using fallback analysis")
@@ -99,6 +637,8 @@ with st.sidebar:
             
             if st.button("Update MongoDB Config"):
                 db_manager.update_mongodb_config(connection_string, database_name)
+                _db_status.clear()
+                get_job_storage().clear_recent()
                 st.success("MongoDB configuration updated!")
                 st.rerun()
         
@@ -113,6 +653,8 @@ with st.sidebar:
             
             if st.button("Update SQLite Config"):
                 db_manager.update_sqlite_config(db_path)
+                _db_status.clear()
+                get_job_storage().clear_recent()
                 st.success("SQLite configuration updated!")
                 st.rerun()
         
@@ -122,12 +664,14 @@ with st.sidebar:
                 if db_manager.switch_database(selected_db):
                     st.success(f"Successfully switched to {available_dbs[selected_db]}")
                     db_manager.initialize_collections()
+                    _db_status.clear()
+                    get_job_storage().clear_recent()
                     st.rerun()
                 else:
                     st.error(f"Failed to switch to {available_dbs[selected_db]}")
         
         # Database status
-        db_info = db_manager.get_database_info()
+        db_info = _db_status()
         st.caption(f"Current: {available_dbs.get(db_info['type'], db_info['type'])}")
         if db_info['connected']:
             st.caption("🟢 Connected")
@@ -136,19 +680,16 @@ with st.sidebar:
     
     st.divider()
     
-    menu_options = ["Dashboard", "Profile Manager", "Export Resume", "Job History"]
-    
     # Get current index based on session state
-    try:
-        current_index = menu_options.index(st.session_state.selected_page)
-    except ValueError:
+    current_index = _MENU_INDEX.get(st.session_state.selected_page)
+    if current_index is None:
         current_index = 0
         st.session_state.selected_page = "Dashboard"
     
     selected = option_menu(
         "Resume Builder",
-        menu_options,
-        icons=['house', 'person', 'download', 'clock-history'],
+        list(_MENU_OPTIONS),
+        icons=list(_MENU_ICONS),
         menu_icon="cast",
         default_index=current_index,
         key="main_menu"
@@ -178,7 +719,7 @@ elif st.session_state.selected_page == "Profile Manager":
     st.markdown("Manage your professional information, experiences, and skills.")
     
     # Load existing profile
-    profile = load_profile()
+    profile = _get_profile()
     
     # Add tabs for editing and viewing
     tab1, tab2 = st.tabs(["✏️ Edit Profile", "👁️ View Profile"])
@@ -189,26 +730,26 @@ elif st.session_state.selected_page == "Profile Manager":
         if not profile:
             st.info("No profile data found. Please create your profile in the Edit Profile tab.")
         else:
+            _get = profile.get
+            experiences = _get('experiences') or []
+            education = _get('education') or []
+            
+            has_skills = any(_get(c) for c in _SKILL_CATEGORIES)
+            
             # Profile completeness calculation
-            required_fields = ['name', 'email', 'skills']
-            completed_fields = sum(1 for field in required_fields if profile.get(field))
-            completeness = (completed_fields / len(required_fields)) * 100
+            completeness = _completeness(bool(_get('name')), bool(_get('email')), has_skills)
             
             # Display metrics
             col1, col2, col3, col4 = st.columns(4)
             with col1:
                 st.metric("Profile Completeness", f"{completeness:.0f}%")
             with col2:
-                st.metric("Experience Entries", len(profile.get('experiences', [])))
+                st.metric("Experience Entries", len(experiences))
             with col3:
-                st.metric("Education Entries", len(profile.get('education', [])))
+                st.metric("Education Entries", len(education))
             with col4:
                 # Count all skills across categories
-                all_skills = []
-                for category in ['programming_skills', 'technologies', 'language_skills', 'certifications']:
-                    skills_text = profile.get(category, '')
-                    if skills_text:
-                        all_skills.extend([s.strip() for s in skills_text.split(',') if s.strip()])
+                all_skills = _all_skills(*(_get(c, '') for c in _SKILL_CATEGORIES))
                 skills_count = len(all_skills)
                 st.metric("Skills Listed", skills_count)
             
@@ -219,77 +760,58 @@ elif st.session_state.selected_page == "Profile Manager":
             col1, col2 = st.columns(2)
             
             with col1:
-                st.write(f"**Name:** {profile.get('name', '❌ Not set')}")
-                st.write(f"**Email:** {profile.get('email', '❌ Not set')}")
-                st.write(f"**Phone:** {profile.get('phone', '❌ Not set')}")
+                st.markdown(
+                    f"**Name:** {_get('name', '❌ Not set')}  \n"
+                    f"**Email:** {_get('email', '❌ Not set')}  \n"
+                    f"**Phone:** {_get('phone', '❌ Not set')}"
+                )
             
             with col2:
-                st.write(f"**Location:** {profile.get('location', '❌ Not set')}")
-                st.write(f"**LinkedIn:** {profile.get('linkedin', '❌ Not set')}")
-                st.write(f"**Website:** {profile.get('website', '❌ Not set')}")
+                st.markdown(
+                    f"**Location:** {_get('location', '❌ Not set')}  \n"
+                    f"**LinkedIn:** {_get('linkedin', '❌ Not set')}  \n"
+                    f"**Website:** {_get('website', '❌ Not set')}"
+                )
             
             # Professional Summary
-            if profile.get('summary'):
+            if _get('summary'):
                 st.subheader("📝 Professional Summary")
                 st.write(profile['summary'])
             
             # Skills
-            skills_categories = {
-                'Programming Skills': profile.get('programming_skills', ''),
-                'Technologies & Tools': profile.get('technologies', ''),
-                'Language Skills': profile.get('language_skills', ''),
-                'Certifications': profile.get('certifications', '')
-            }
-            
-            # Check if any skills exist
-            has_skills = any(skills for skills in skills_categories.values())
-            
             if has_skills:
                 st.subheader("🛠️ Skills")
+                st.markdown(_SKILL_TAG_CSS, unsafe_allow_html=True)
                 
-                for category, skills_text in skills_categories.items():
+                for category, key in _SKILLS_CATEGORY_DISPLAY:
+                    skills_text = _get(key, '')
                     if skills_text:
                         st.markdown(f"**{category}:**")
-                        skills_list = [skill.strip() for skill in skills_text.split(',') if skill.strip()]
                         
                         # Display skills as tags with different colors for each category
-                        color_map = {
-                            'Programming Skills': '#e1f5fe',
-                            'Technologies & Tools': '#f3e5f5', 
-                            'Language Skills': '#e8f5e8',
-                            'Certifications': '#fff3e0'
-                        }
-                        
-                        skills_html = ""
-                        for skill in skills_list:
-                            color = color_map.get(category, '#e1f5fe')
-                            skills_html += f'<span style="background-color: {color}; color: #333; padding: 2px 8px; margin: 2px; border-radius: 12px; font-size: 12px; display: inline-block;">{skill}</span>'
-                        
-                        st.markdown(skills_html, unsafe_allow_html=True)
+                        st.markdown(
+                            _skills_html(category, skills_text),
+                            unsafe_allow_html=True
+                        )
                         st.write("")  # Add space between categories
             
             # Experience
-            experiences = profile.get('experiences', [])
             if experiences:
                 st.subheader("💼 Work Experience")
                 
                 for i, exp in enumerate(experiences):
                     with st.expander(f"📍 {exp.get('title', 'Position')} - {exp.get('company', 'Company')}", expanded=i==0):
-                        col1, col2 = st.columns([2, 1])
-                        
-                        with col1:
-                            st.write(f"**Position:** {exp.get('title', 'Not specified')}")
-                            st.write(f"**Company:** {exp.get('company', 'Not specified')}")
-                        
-                        with col2:
-                            st.write(f"**Duration:** {exp.get('duration', 'Not specified')}")
+                        st.markdown(
+                            f"**Position:** {exp.get('title', 'Not specified')}  \n"
+                            f"**Company:** {exp.get('company', 'Not specified')}  \n"
+                            f"**Duration:** {exp.get('duration', 'Not specified')}"
+                        )
                         
                         if exp.get('description'):
                             st.write("**Description:**")
                             st.write(exp['description'])
             
             # Education
-            education = profile.get('education', [])
             if education:
                 st.subheader("🎓 Education")
                 
@@ -299,234 +821,189 @@ elif st.session_state.selected_page == "Profile Manager":
                         degree_field += f" in {edu.get('field')}"
                     
                     with st.expander(f"🏫 {degree_field} - {edu.get('institution', 'Institution')}", expanded=i==0):
-                        col1, col2 = st.columns([2, 1])
-                        
-                        with col1:
-                            st.write(f"**Institution:** {edu.get('institution', 'Not specified')}")
-                            st.write(f"**Degree:** {edu.get('degree', 'Not specified')}")
-                            st.write(f"**Field of Study:** {edu.get('field', 'Not specified')}")
-                        
-                        with col2:
-                            st.write(f"**Year:** {edu.get('year', 'Not specified')}")
+                        st.markdown(
+                            f"**Institution:** {edu.get('institution', 'Not specified')}  \n"
+                            f"**Degree:** {edu.get('degree', 'Not specified')}  \n"
+                            f"**Field of Study:** {edu.get('field', 'Not specified')}  \n"
+                            f"**Year:** {edu.get('year', 'Not specified')}"
+                        )
                         
                         if edu.get('details'):
                             st.write("**Additional Details:**")
                             st.write(edu['details'])
             
             # Last updated
-            if profile.get('last_updated'):
+            if _get('last_updated'):
                 st.caption(f"Last updated: {profile['last_updated']}")
     
     with tab1:
         st.subheader("Edit Profile Information")
         
-        # Personal Information
-        st.subheader("Personal Information")
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            name = st.text_input("Full Name", value=profile.get('name', ''))
-            email = st.text_input("Email", value=profile.get('email', ''))
-            phone = st.text_input("Phone", value=profile.get('phone', ''))
-        
-        with col2:
-            location = st.text_input("Location", value=profile.get('location', ''))
-            linkedin = st.text_input("LinkedIn URL", value=profile.get('linkedin', ''))
-            website = st.text_input("Website/Portfolio", value=profile.get('website', ''))
-        
-        # Professional Summary
-        st.subheader("Professional Summary")
-        summary = st.text_area("Professional Summary", value=profile.get('summary', ''), height=100)
-        
-        # Skills
-        st.subheader("Skills")
-        st.markdown("Organize your skills into categories for better presentation on your resume.")
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            programming_skills = st.text_area(
-                "Programming Skills", 
-                value=profile.get('programming_skills', ''), 
-                height=80,
-                help="e.g., Python, Java, JavaScript, C++, SQL"
-            )
-            
-            language_skills = st.text_area(
-                "Language Skills", 
-                value=profile.get('language_skills', ''), 
-                height=80,
-                help="e.g., English (Native), Spanish (Fluent), Mandarin (Conversational)"
-            )
-        
-        with col2:
-            technologies = st.text_area(
-                "Technologies & Tools", 
-                value=profile.get('technologies', ''), 
-                height=80,
-                help="e.g., React, AWS, Docker, Git, Tableau, Excel"
-            )
-            
-            certifications = st.text_area(
-                "Certifications", 
-                value=profile.get('certifications', ''), 
-                height=80,
-                help="e.g., AWS Certified Solutions Architect, PMP, Google Analytics"
-            )
-        
-        # Experience
-        st.subheader("Work Experience")
-        
-        # Initialize experiences in session state if not exists
+        # Initialize experiences and education in session state if not exists
         if 'temp_experiences' not in st.session_state:
-            st.session_state.temp_experiences = profile.get('experiences', []).copy()
-        
-        # Add new experience
-        if st.button("➕ Add Experience"):
-            st.session_state.temp_experiences.append({
-                'title': '',
-                'company': '',
-                'duration': '',
-                'description': ''
-            })
-            st.rerun()
-        
-        # Display experiences
-        experiences = st.session_state.temp_experiences
-        updated_experiences = []
-        
-        for i, exp in enumerate(experiences):
-            with st.expander(f"Experience {i+1}", expanded=True if exp.get('title', '') == '' else False):
-                col1, col2 = st.columns(2)
-                with col1:
-                    title = st.text_input(f"Job Title", value=exp.get('title', ''), key=f"title_{i}")
-                    company = st.text_input(f"Company", value=exp.get('company', ''), key=f"company_{i}")
-                with col2:
-                    duration = st.text_input(f"Duration (e.g., Jan 2020 - Dec 2022)", value=exp.get('duration', ''), key=f"duration_{i}")
-                
-                description = st.text_area(f"Job Description", value=exp.get('description', ''), key=f"desc_{i}", height=100,
-                                         help="Describe your responsibilities, achievements, and key accomplishments")
-                
-                # Store updated values
-                updated_exp = {
-                    'title': title,
-                    'company': company,
-                    'duration': duration,
-                    'description': description
-                }
-                updated_experiences.append(updated_exp)
-                
-                # Remove experience button
-                if st.button(f"🗑️ Remove Experience {i+1}", key=f"remove_{i}"):
-                    st.session_state.temp_experiences.pop(i)
-                    st.rerun()
-        
-        # Update session state with current values
-        st.session_state.temp_experiences = updated_experiences
-        
-        # Education
-        st.subheader("Education")
-        
-        # Initialize education in session state if not exists
+            st.session_state.temp_experiences = list(profile.get('experiences') or ())
         if 'temp_education' not in st.session_state:
-            st.session_state.temp_education = profile.get('education', []).copy()
+            st.session_state.temp_education = list(profile.get('education') or ())
         
-        # Add new education
-        if st.button("➕ Add Education"):
-            st.session_state.temp_education.append({
-                'institution': '',
-                'degree': '',
-                'field': '',
-                'year': '',
-                'details': ''
-            })
-            st.rerun()
+        # Fold the submitted row edits back into the row lists on every run.
+        # Row widget keys are dropped once the rows stop rendering (e.g. on
+        # another page), and the rows then re-seed from these lists
+        st.session_state.temp_experiences = _collect_rows(st.session_state.temp_experiences, _EXPERIENCE_FIELDS)
+        st.session_state.temp_education = _collect_rows(st.session_state.temp_education, _EDUCATION_FIELDS)
         
-        # Display education
-        education = st.session_state.temp_education
-        updated_education = []
+        # Seed the form inputs from the saved profile once; afterwards the
+        # widget keys hold the edits
+        _get = profile.get
+        for field in _PROFILE_TEXT_FIELDS:
+            st.session_state.setdefault(f"edit_{field}", _get(field, ''))
         
-        for i, edu in enumerate(education):
-            with st.expander(f"Education {i+1}", expanded=True if edu.get('institution', '') == '' else False):
-                col1, col2 = st.columns(2)
-                with col1:
-                    institution = st.text_input(f"Institution/School", value=edu.get('institution', ''), key=f"edu_inst_{i}")
-                    degree = st.text_input(f"Degree/Certification", value=edu.get('degree', ''), key=f"edu_degree_{i}")
-                with col2:
-                    field = st.text_input(f"Field of Study", value=edu.get('field', ''), key=f"edu_field_{i}")
-                    year = st.text_input(f"Year/Duration (e.g., 2018-2022)", value=edu.get('year', ''), key=f"edu_year_{i}")
-                
-                details = st.text_area(f"Additional Details", value=edu.get('details', ''), key=f"edu_details_{i}", height=80,
-                                     help="GPA, honors, relevant coursework, achievements, etc.")
-                
-                # Store updated values
-                updated_edu = {
-                    'institution': institution,
-                    'degree': degree,
-                    'field': field,
-                    'year': year,
-                    'details': details
+        # Inputs are batched in a form so typing doesn't rerun the page;
+        # only the add/remove/save buttons submit
+        with st.form("edit_profile", clear_on_submit=False):
+            # Personal Information
+            st.subheader("Personal Information")
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                name = st.text_input("Full Name", key="edit_name")
+                email = st.text_input("Email", key="edit_email")
+                phone = st.text_input("Phone", key="edit_phone")
+            
+            with col2:
+                location = st.text_input("Location", key="edit_location")
+                linkedin = st.text_input("LinkedIn URL", key="edit_linkedin")
+                website = st.text_input("Website/Portfolio", key="edit_website")
+            
+            # Professional Summary
+            st.subheader("Professional Summary")
+            summary = st.text_area("Professional Summary", key="edit_summary", height=100)
+            
+            # Skills
+            st.subheader("Skills")
+            st.markdown("Organize your skills into categories for better presentation on your resume.")
+            
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                programming_skills = st.text_area(
+                    "Programming Skills", 
+                    key="edit_programming_skills",
+                    height=80,
+                    help="e.g., Python, Java, JavaScript, C++, SQL"
+                )
+            
+                language_skills = st.text_area(
+                    "Language Skills", 
+                    key="edit_language_skills",
+                    height=80,
+                    help="e.g., English (Native), Spanish (Fluent), Mandarin (Conversational)"
+                )
+            
+            with col2:
+                technologies = st.text_area(
+                    "Technologies & Tools", 
+                    key="edit_technologies",
+                    height=80,
+                    help="e.g., React, AWS, Docker, Git, Tableau, Excel"
+                )
+            
+                certifications = st.text_area(
+                    "Certifications", 
+                    key="edit_certifications",
+                    height=80,
+                    help="e.g., AWS Certified Solutions Architect, PMP, Google Analytics"
+                )
+            
+            # Experience
+            st.subheader("Work Experience")
+            
+            # Add new experience
+            if st.form_submit_button("➕ Add Experience"):
+                st.session_state.temp_experiences.append({
+                    'title': '',
+                    'company': '',
+                    'duration': '',
+                    'description': ''
+                })
+                st.rerun()
+            
+            # Display experiences
+            for i in range(len(st.session_state.temp_experiences)):
+                _experience_row(i)
+            
+            # Education
+            st.subheader("Education")
+            
+            # Add new education
+            if st.form_submit_button("➕ Add Education"):
+                st.session_state.temp_education.append({
+                    'institution': '',
+                    'degree': '',
+                    'field': '',
+                    'year': '',
+                    'details': ''
+                })
+                st.rerun()
+            
+            # Display education
+            for i in range(len(st.session_state.temp_education)):
+                _education_row(i)
+            
+            # Save profile
+            if st.form_submit_button("💾 Save Profile", type="primary"):
+                profile_data = {
+                    'name': name,
+                    'email': email,
+                    'phone': phone,
+                    'location': location,
+                    'linkedin': linkedin,
+                    'website': website,
+                    'summary': summary,
+                    'programming_skills': programming_skills,
+                    'technologies': technologies,
+                    'language_skills': language_skills,
+                    'certifications': certifications,
+                    'experiences': list(st.session_state.temp_experiences),
+                    'education': list(st.session_state.temp_education)
                 }
-                updated_education.append(updated_edu)
-                
-                # Remove education button
-                if st.button(f"🗑️ Remove Education {i+1}", key=f"remove_edu_{i}"):
-                    st.session_state.temp_education.pop(i)
-                    st.rerun()
-        
-        # Update session state with current values
-        st.session_state.temp_education = updated_education
-        
-        # Save profile
-        if st.button("💾 Save Profile", type="primary"):
-            profile_data = {
-                'name': name,
-                'email': email,
-                'phone': phone,
-                'location': location,
-                'linkedin': linkedin,
-                'website': website,
-                'summary': summary,
-                'programming_skills': programming_skills,
-                'technologies': technologies,
-                'language_skills': language_skills,
-                'certifications': certifications,
-                'experiences': st.session_state.temp_experiences,
-                'education': st.session_state.temp_education,
-                'last_updated': datetime.now().isoformat()
-            }
-            save_profile(profile_data)
-            st.success("Profile saved successfully!")
-            st.info("💡 Switch to 'View Profile' tab to see your updated information.")
+                if save_profile(profile_data):
+                    st.success("Profile saved successfully!")
+                    st.info("💡 Switch to 'View Profile' tab to see your updated information.")
+                else:
+                    st.info("No changes to save.")
         
         # Reset changes buttons
         col1, col2 = st.columns(2)
         with col1:
             if st.button("🔄 Reset Experience Changes"):
-                st.session_state.temp_experiences = profile.get('experiences', []).copy()
+                profile = st.session_state.profile_data = load_profile()
+                st.session_state.temp_experiences = list(profile.get('experiences') or ())
+                _clear_widget_state("title_", "company_", "duration_", "desc_")
                 st.rerun()
         
         with col2:
             if st.button("🔄 Reset Education Changes"):
-                st.session_state.temp_education = profile.get('education', []).copy()
+                profile = st.session_state.profile_data = load_profile()
+                st.session_state.temp_education = list(profile.get('education') or ())
+                _clear_widget_state("edu_")
                 st.rerun()
 
 
 # Export Resume Page
 elif st.session_state.selected_page == "Export Resume":
+    job_storage = get_job_storage()
     st.title("📥 Resume Builder & Export")
     st.markdown("Create, tailor, and download your professional resume.")
     
     # Load profile
-    profile = load_profile()
+    profile = _get_profile()
     
     if not profile:
         st.warning("⚠️ Please set up your profile first.")
         if st.button("Go to Profile Manager", key="goto_profile_manager"):
             st.session_state.selected_page = "Profile Manager"
             # Clear the option menu state to force it to update
-            if "main_menu" in st.session_state:
-                del st.session_state.main_menu
+            st.session_state.pop("main_menu", None)
             st.rerun()
     else:
         # Main workflow tabs
@@ -546,25 +1023,28 @@ elif st.session_state.selected_page == "Export Resume":
             if st.button("🔍 Analyze Job & Tailor Resume", type="primary"):
                 if job_description:
                     try:
+                        # Calculate skills coverage
+                        all_skills = _all_skills(*(profile.get(c, '') for c in _SKILL_CATEGORIES))
+                        
+                        # Skip the LLM round-trip when the same job description is
+                        # analyzed again against unchanged skills
+                        jd_hash = hashlib.sha1((job_description + '|' + ','.join(all_skills)).encode()).hexdigest()
+                        previous = st.session_state.get('tailored_resume') or {}
+                        save_future = None
+                        
                         with st.spinner("Analyzing job description and tailoring your resume..."):
-                            analyzer = get_job_analyzer()
-                            if not analyzer:
-                                st.error("Something is wrong with the get_job_analyzer function.")
-                                st.stop()
-                            
-                            analysis = analyzer.analyze_job_description(job_description)
-                            
-                            # Calculate skills coverage
-                            all_skills = []
-                            for category in ['programming_skills', 'technologies', 'language_skills', 'certifications']:
-                                skills_text = profile.get(category, '')
-                                if skills_text:
-                                    all_skills.extend([s.strip() for s in skills_text.split(',') if s.strip()])
-                            
-                            coverage_score = analyzer.calculate_match_score(all_skills, analysis)
-                            
-                            # Auto-save job analysis to database
-                            try:
+                            if previous.get('jd_hash') == jd_hash:
+                                analysis = previous['job_analysis']
+                                coverage_score = previous['coverage_score']
+                            else:
+                                analyzer = get_job_analyzer()
+                                if not analyzer:
+                                    st.error("Something is wrong with the get_job_analyzer function.")
+                                    st.stop()
+                                
+                                analysis = _analyze_job(job_description)
+                                coverage_score = _match_score(all_skills, analysis)
+                                
                                 # Extract job title and company from job description if possible
                                 job_title = "Unknown Position"
                                 company = "Unknown Company"
@@ -575,23 +1055,40 @@ elif st.session_state.selected_page == "Export Resume":
                                 if analysis.get('company'):
                                     company = analysis['company']
                                 
-                                analysis_id = job_storage.save_job_analysis(
+                                # Auto-save job analysis to database in the background
+                                # while the tailored content is generated below
+                                save_future = get_executor().submit(
+                                    job_storage.save_job_analysis,
                                     job_description=job_description,
                                     analysis=analysis,
                                     job_title=job_title,
                                     company=company
                                 )
-                                st.success(f"✅ Job analysis automatically saved to database!")
-                            except Exception as e:
-                                st.warning(f"Could not save to database: {e}")
                             
-                            # Store tailored resume data
+                            # Store tailored resume data along with the derived tailoring
+                            # so the insights and Preview/Download tabs don't recompute it
+                            generator = get_resume_generator()
                             st.session_state.tailored_resume = {
                                 'job_analysis': analysis,
                                 'coverage_score': coverage_score,
                                 'job_description': job_description,
-                                'timestamp': datetime.now().isoformat()
+                                'jd_hash': jd_hash,
+                                'timestamp': _now_iso(),
+                                'original_skills': generator.generate_categorized_skills_text(profile),
+                                'tailored_skills': generator.generate_tailored_skills(profile, analysis),
+                                'prioritized_experiences': generator.prioritize_experiences(profile.get('experiences') or [], analysis),
+                                '_display': _tailoring_display(analysis)
                             }
+                            tailored_data = st.session_state.tailored_resume
+                            
+                            if save_future is not None:
+                                try:
+                                    save_future.result(timeout=30)
+                                    # Job History pages were fetched before this analysis existed
+                                    st.session_state.pop('analyses_query', None)
+                                    st.success(f"✅ Job analysis automatically saved to database!")
+                                except Exception as e:
+                                    st.warning(f"Could not save to database: {e}")
                         
                         st.success("✅ Resume tailored successfully!")
                         
@@ -620,11 +1117,9 @@ elif st.session_state.selected_page == "Export Resume":
                         # Tailoring insights
                         st.markdown("### 💡 Tailoring Applied")
                         
-                        generator = get_resume_generator()
-                        
                         # Skills insights
-                        original_skills = generator.generate_categorized_skills_text(profile)
-                        tailored_skills = generator.generate_tailored_skills(profile, analysis)
+                        original_skills = tailored_data['original_skills']
+                        tailored_skills = tailored_data['tailored_skills']
                         
                         if original_skills != tailored_skills:
                             with st.expander("🛠️ Skills Optimization"):
@@ -632,9 +1127,9 @@ elif st.session_state.selected_page == "Export Resume":
                                 st.write(f"**Optimized Skills:** {tailored_skills[:200]}...")
                         
                         # Experience insights
-                        experiences = profile.get('experiences', [])
+                        experiences = profile.get('experiences') or []
                         if experiences:
-                            prioritized_exp = generator.prioritize_experiences(experiences, analysis)
+                            prioritized_exp = tailored_data['prioritized_experiences']
                             if experiences != prioritized_exp:
                                 with st.expander("💼 Experience Prioritization"):
                                     st.write("**Experience has been reordered by relevance to this job:**")
@@ -649,28 +1144,30 @@ elif st.session_state.selected_page == "Export Resume":
                     st.error("Please provide a job description.")
             
             # Show current tailored resume status
-            if hasattr(st.session_state, 'tailored_resume'):
+            tailored_data = st.session_state.get('tailored_resume')
+            if tailored_data is not None:
                 with st.expander("ℹ️ Current Tailored Resume Status"):
-                    tailored_data = st.session_state.tailored_resume
                     st.write(f"**Created:** {tailored_data.get('timestamp', 'Unknown')}")
                     st.write(f"**Skills Coverage:** {tailored_data.get('coverage_score', 0)}%")
                     
                     if st.button("🗑️ Clear Tailored Resume"):
-                        del st.session_state.tailored_resume
+                        st.session_state.pop('tailored_resume', None)
+                        st.session_state.pop('resume_download', None)
                         st.rerun()
         
         with tab2:
             st.subheader("👁️ Preview & Download Resume")
             
             # Check if tailored resume exists
-            has_tailored = hasattr(st.session_state, 'tailored_resume')
+            tailored_data = st.session_state.get('tailored_resume')
+            has_tailored = tailored_data is not None
             
             if has_tailored:
-                job_analysis = st.session_state.tailored_resume.get('job_analysis')
-                coverage = st.session_state.tailored_resume.get('coverage_score', 0)
+                job_analysis = tailored_data.get('job_analysis')
+                coverage = tailored_data.get('coverage_score', 0)
                 
                 # Status and controls
-                col1, col2, col3 = st.columns([2, 1, 1])
+                col1, col2 = st.columns([3, 1])
                 with col1:
                     st.success("🎯 Job-Tailored Resume Ready")
                     st.metric("Skills Coverage", f"{coverage}%", "Optimized for analyzed job")
@@ -678,71 +1175,33 @@ elif st.session_state.selected_page == "Export Resume":
                 with col2:
                     show_comparison = st.checkbox("🔄 Show Comparison")
                 
-                with col3:
-                    format_choice = st.selectbox("Format", ["PDF", "Word Document"])
-                
-                # Download button at the top
-                if st.button("📥 Generate & Download Resume", type="primary", use_container_width=True):
-                    try:
-                        with st.spinner(f"Generating {format_choice.lower()}..."):
-                            generator = get_resume_generator()
-                            
-                            if format_choice == "PDF":
-                                buffer = generator.generate_pdf_resume(profile, job_analysis)
-                                filename = "resume_tailored.pdf"
-                                mime_type = "application/pdf"
-                            else:  # Word Document
-                                buffer = generator.generate_word_resume(profile, job_analysis)
-                                filename = "resume_tailored.docx"
-                                mime_type = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
-                        
-                        # Immediate download
-                        st.download_button(
-                            label=f"📥 Download {format_choice}",
-                            data=buffer.getvalue(),
-                            file_name=filename,
-                            mime=mime_type,
-                            type="primary",
-                            use_container_width=True
-                        )
-                        
-                    except Exception as e:
-                        st.error(f"Error generating {format_choice.lower()}: {str(e)}")
+                # Download controls at the top
+                _download_panel(profile, job_analysis)
                 
                 st.divider()
                 
                 # Preview section
-                generator = get_resume_generator()
-                preview = get_resume_preview()
-                
-                if show_comparison:
-                    preview.show_comparison(profile, job_analysis, generator)
-                else:
-                    preview.display_preview(profile, job_analysis, generator)
+                _render_preview(
+                    show_comparison, profile, job_analysis,
+                    tailored_data.get('original_skills'),
+                    tailored_data.get('tailored_skills'),
+                    tailored_data.get('prioritized_experiences')
+                )
                 
                 # Tailoring details
                 st.divider()
                 
                 with st.expander("📊 Tailoring Details", expanded=False):
-                    analysis = st.session_state.tailored_resume.get('job_analysis', {})
+                    display = tailored_data.get('_display') or _tailoring_display(tailored_data.get('job_analysis', {}))
                     col1, col2 = st.columns(2)
                     with col1:
-                        # Handle different priority skill formats for display
-                        priority_skills = analysis.get('priority_skills', [])
-                        if priority_skills:
-                            skill_names = []
-                            for s in priority_skills[:5]:
-                                if isinstance(s, dict):
-                                    skill_names.append(s.get('skill', str(s)))
-                                else:
-                                    skill_names.append(str(s))
-                            st.write(f"**Priority Skills:** {', '.join(skill_names)}")
-                        else:
-                            st.write("**Priority Skills:** None identified")
-                        st.write(f"**Experience Level:** {analysis.get('experience_level', 'Unknown').title()}")
+                        st.write(f"**Priority Skills:** {display['priority_skills'] or 'None identified'}")
+                        st.write(f"**Experience Level:** {display['experience_level']}")
                     with col2:
-                        st.write(f"**Key Requirements:** {len(analysis.get('requirements', []))} identified")
-                        st.write(f"**Technical Skills:** {len(analysis.get('technical_skills', []))} found")
+                        st.markdown(
+                            f"**Key Requirements:** {display['requirements_count']} identified  \n"
+                            f"**Technical Skills:** {display['technical_skills_count']} found"
+                        )
             
             else:
                 st.warning("⚠️ No tailored resume available. Please analyze a job description in the 'Tailor Resume' tab first.")
@@ -750,17 +1209,19 @@ elif st.session_state.selected_page == "Export Resume":
 
 # Job History Page
 elif st.session_state.selected_page == "Job History":
+    job_storage = get_job_storage()
     st.title("📊 Job Analysis History")
     
     try:
         # Database status check
-        db_info = db_manager.get_database_info()
+        db_info = _db_status()
         if not db_info['connected']:
             st.error("🔴 Database not connected. Please configure database in the sidebar.")
             st.stop()
         
-        # Statistics
-        stats = job_storage.get_analysis_stats()
+        # Statistics, recomputed only when analyses were added or deleted
+        stats_token = job_storage.get_stats_token()
+        stats = _analysis_stats(db_info['type'], stats_token)
         if stats:
             col1, col2, col3, col4 = st.columns(4)
             with col1:
@@ -771,88 +1232,15 @@ elif st.session_state.selected_page == "Job History":
                 top_skills = stats.get('top_skills', [])
                 st.metric("Top Skill", top_skills[0][0] if top_skills else "None")
             with col4:
-                exp_levels = stats.get('experience_levels', {})
-                most_common_level = max(exp_levels.items(), key=lambda x: x[1])[0] if exp_levels else "None"
-                st.metric("Common Level", most_common_level.title())
+                st.metric("Common Level", (stats.get('common_level') or "None").title())
         
         st.divider()
         
-        # Search and filters
-        col1, col2 = st.columns([2, 1])
-        with col1:
-            search_term = st.text_input("🔍 Search job analyses", placeholder="Search by job title, company, or skills...")
-        with col2:
-            limit = st.selectbox("Show", [10, 20, 50], index=1)
-        
-        # Filter options
-        with st.expander("🎯 Advanced Filters"):
-            filter_col1, filter_col2 = st.columns(2)
-            with filter_col1:
-                companies = stats.get('companies', [])
-                selected_company = st.selectbox("Company", ["All"] + companies, index=0)
-            with filter_col2:
-                exp_levels = list(stats.get('experience_levels', {}).keys())
-                selected_exp_level = st.selectbox("Experience Level", ["All"] + exp_levels, index=0)
-        
-        # Get job analyses
-        if search_term:
-            analyses = job_storage.search_analyses(search_term, limit=limit)
-        else:
-            company_filter = None if selected_company == "All" else selected_company
-            exp_level_filter = None if selected_exp_level == "All" else selected_exp_level
-            analyses = job_storage.get_job_analyses(
-                limit=limit, 
-                company=company_filter, 
-                experience_level=exp_level_filter
-            )
-        
-        if analyses:
-            st.subheader(f"📋 Found {len(analyses)} job analyses")
-            
-            for i, analysis in enumerate(analyses):
-                with st.expander(f"#{i+1} {analysis.get('job_title', 'Unknown Position')} @ {analysis.get('company', 'Unknown Company')}", expanded=False):
-                    col1, col2 = st.columns([2, 1])
-                    
-                    with col1:
-                        st.write(f"**Job Title:** {analysis.get('job_title', 'N/A')}")
-                        st.write(f"**Company:** {analysis.get('company', 'N/A')}")
-                        st.write(f"**Experience Level:** {analysis.get('experience_level', 'N/A').title()}")
-                        st.write(f"**Skills Count:** {analysis.get('skills_count', 0)}")
-                        
-                        # Show top skills
-                        analysis_data = analysis.get('analysis', {})
-                        technical_skills = analysis_data.get('technical_skills', [])[:5]
-                        if technical_skills:
-                            st.write(f"**Top Skills:** {', '.join(technical_skills)}")
-                    
-                    with col2:
-                        created_at = analysis.get('created_at', '')
-                        if created_at:
-                            from datetime import datetime
-                            try:
-                                dt = datetime.fromisoformat(created_at)
-                                st.write(f"**Analyzed:** {dt.strftime('%Y-%m-%d %H:%M')}")
-                            except:
-                                st.write(f"**Analyzed:** {created_at}")
-                        
-                        # Action buttons
-                        if st.button(f"🗑️ Delete", key=f"delete_{analysis['_id']}"):
-                            if job_storage.delete_job_analysis(analysis['_id']):
-                                st.success("Analysis deleted!")
-                                st.rerun()
-                            else:
-                                st.error("Failed to delete analysis")
-                    
-                    # Job description preview
-                    job_desc = analysis.get('job_description', '')
-                    if job_desc:
-                        st.write("**Job Description:**")
-                        st.text_area("", value=job_desc[:500] + "..." if len(job_desc) > 500 else job_desc, height=100, disabled=True, key=f"desc_{analysis['_id']}")
-        else:
-            st.info("🔍 No job analyses found. Start by analyzing some job descriptions!")
-            if st.button("📝 Analyze Your First Job"):
-                st.session_state.selected_page = "Export Resume"
-                st.rerun()
+        # Search, filters and results rerun on their own
+        _history_results(
+            job_storage, db_info['type'], stats_token,
+            list(stats.get('experience_levels', {}).keys())
+        )
     
     except Exception as e:
         st.error(f"Error loading job history: {e}")
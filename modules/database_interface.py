@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime
 import json
 
@@ -23,8 +23,18 @@ class DatabaseInterface(ABC):
     
     @abstractmethod
     def find_documents(self, collection: str, query: Dict[str, Any] = None, 
-                      limit: Optional[int] = None, sort_by: Optional[str] = None) -> List[Dict[str, Any]]:
-        """Find documents matching query"""
+                      limit: Optional[int] = None, sort_by: Optional[str] = None,
+                      after: Optional[Tuple[Any, str]] = None,
+                      fields: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """Find documents matching query
+        
+        When sorting, ties are broken by document ID. ``after`` is a keyset
+        cursor ``(sort value, document ID)`` taken from the last document of the
+        previous page; only documents that come after it in sort order are returned.
+        ``fields`` limits the returned documents to those (dotted) paths plus
+        ``_id`` and ``created_at``; an array path may end in ``[:N]`` to return
+        only its first N items.
+        """
         pass
     
     @abstractmethod
@@ -42,6 +52,17 @@ class DatabaseInterface(ABC):
         """Delete a document by ID"""
         pass
     
+    @abstractmethod
+    def delete_documents(self, collection: str, doc_ids: List[str]) -> int:
+        """Delete several documents by ID in one operation; returns how many were deleted"""
+        pass
+    
+    @abstractmethod
+    def distinct_values(self, collection: str, field: str, prefix: str = "",
+                        limit: int = 20) -> List[Any]:
+        """Distinct values of a field, optionally only those starting with prefix (case-insensitive)"""
+        pass
+    
     @abstractmethod
     def count_documents(self, collection: str, query: Dict[str, Any] = None) -> int:
         """Count documents matching query"""
@@ -57,6 +78,14 @@ class DatabaseInterface(ABC):
         """List all collections/tables"""
         pass
     
+    @staticmethod
+    def parse_field(field: str) -> Tuple[str, Optional[int]]:
+        """Split a projection field like ``'analysis.skills[:5]'`` into (path, slice length)"""
+        if field.endswith(']') and '[:' in field:
+            path, _, count = field[:-1].rpartition('[:')
+            return path, int(count)
+        return field, None
+    
     def add_metadata(self, document: Dict[str, Any]) -> Dict[str, Any]:
         """Add common metadata to documents"""
         document['created_at'] = datetime.utcnow().isoformat()
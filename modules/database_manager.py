@@ -192,28 +192,44 @@ class DatabaseManager:
             for collection in collections:
                 db.create_collection(collection)
             
-            # Create indexes for MongoDB
+            # Indexes backing the Job History queries: newest-first listing,
+            # optionally filtered by company or experience level
+            job_history_indexes = [
+                {"fields": [("created_at", -1), ("_id", -1)]},
+                {"fields": [("company", 1), ("created_at", -1), ("_id", -1)]},
+                {"fields": [("experience_level", 1), ("created_at", -1), ("_id", -1)]}
+            ]
+            
             if isinstance(db, MongoDatabase):
-                # Index for job analyses
-                db.create_indexes("job_analyses", [
-                    {"field": "created_at"},
+                db.create_indexes("job_analyses", job_history_indexes + [
                     {"field": "job_title"},
-                    {"field": "company"}
+                    # Full-text search over titles, companies and skills
+                    {"fields": [
+                        ("job_title", "text"),
+                        ("company", "text"),
+                        ("tags", "text"),
+                        ("analysis.technical_skills", "text")
+                    ]}
                 ])
+            elif isinstance(db, SQLiteDatabase):
+                db.create_indexes("job_analyses", job_history_indexes)
             
             return True
         except Exception as e:
             print(f"Error initializing collections: {e}")
             return False
 
-# Global database manager instance
-db_manager = DatabaseManager()
-
-# Auto-initialize SQLite connection on startup
-try:
-    if not db_manager.get_database():
-        print("Warning: Could not initialize any database connection")
-    else:
-        db_manager.initialize_collections()
-except Exception as e:
-    print(f"Error during database initialization: {e}")
\ No newline at end of file
+def create_db_manager() -> DatabaseManager:
+    """Create a database manager and open the configured connection"""
+    manager = DatabaseManager()
+    
+    # Auto-initialize the configured connection (falls back to SQLite)
+    try:
+        if not manager.get_database():
+            print("Warning: Could not initialize any database connection")
+        else:
+            manager.initialize_collections()
+    except Exception as e:
+        print(f"Error during database initialization: {e}")
+    
+    return manager
\ No newline at end of file
@@ -221,15 +221,15 @@ class JobAnalyzer:
         if not profile_skills:
             return 0.0
         
-        profile_skills_lower = [skill.lower().strip() for skill in profile_skills]
+        # Sets throughout, so the priority lookups below are hash checks
+        profile_skills_lower = {skill.lower().strip() for skill in profile_skills}
         job_skills = job_analysis['skills']['technical'] + job_analysis['skills']['soft']
-        job_skills_lower = [skill.lower() for skill in job_skills]
         
-        if not job_skills_lower:
+        if not job_skills:
             return 0.0
         
         # Calculate intersection
-        matching_skills = set(profile_skills_lower) & set(job_skills_lower)
+        matching_skills = profile_skills_lower & {skill.lower() for skill in job_skills}
         
         # Weight by priority skills
         priority_weight = 0
@@ -242,7 +242,7 @@ class JobAnalyzer:
                     priority_weight += 2 if is_high_priority else 1
         
         # Base score from skill overlap
-        base_score = len(matching_skills) / len(job_skills_lower)
+        base_score = len(matching_skills) / len(job_skills)
         
         # Adjusted score with priority weighting
         adjusted_score = min(1.0, base_score + (priority_weight * 0.1))
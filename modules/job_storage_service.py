@@ -1,18 +1,36 @@
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
+from collections import OrderedDict
 from datetime import datetime
-from .database_manager import db_manager
+import copy
+import threading
+import weakref
+from .database_manager import DatabaseManager
+from .mongodb_database import MongoDatabase
 
 class JobAnalysisStorage:
     """Service for storing and retrieving job analysis data"""
     
-    def __init__(self):
+    # How many recently viewed analyses get_job_analysis keeps in memory
+    RECENT_CACHE_SIZE = 128
+    
+    # Characters of the job description stored separately for list previews
+    PREVIEW_LENGTH = 500
+    
+    def __init__(self, db_manager: DatabaseManager):
+        self.db_manager = db_manager
         self.collection = "job_analyses"
+        # Database connections already backfilled with search_blob; a new
+        # connection (database switch or reconnect) gets checked again
+        self._search_blobs_checked = weakref.WeakSet()
+        # Shared by every session thread, so all access goes through the lock
+        self._recent: OrderedDict = OrderedDict()
+        self._recent_lock = threading.Lock()
     
     def save_job_analysis(self, job_description: str, analysis: Dict[str, Any], 
                          job_title: str = None, company: str = None, 
                          job_url: str = None) -> str:
         """Save job analysis to database"""
-        db = db_manager.get_database()
+        db = self.db_manager.get_database()
         if not db:
             raise Exception("Database not available")
         
@@ -25,6 +43,8 @@ class JobAnalysisStorage:
         # Create document
         document = {
             'job_description': job_description,
+            'job_description_preview': job_description[:self.PREVIEW_LENGTH],
+            'job_description_length': len(job_description),
             'job_title': job_title or 'Unknown Position',
             'company': company or 'Unknown Company',
             'job_url': job_url,
@@ -33,21 +53,49 @@ class JobAnalysisStorage:
             'skills_count': self._count_skills(analysis),
             'experience_level': analysis.get('experience_level', 'unknown')
         }
+        # MongoDB searches through its text index; other backends match
+        # against this precomputed lowercase blob
+        if not isinstance(db, MongoDatabase):
+            document['search_blob'] = self._search_blob(document)
         
         return db.insert_document(self.collection, document)
     
     def get_job_analysis(self, analysis_id: str) -> Optional[Dict[str, Any]]:
-        """Get a specific job analysis by ID"""
-        db = db_manager.get_database()
+        """Get a specific job analysis by ID, served from the recent cache when possible
+        
+        Returns a deep copy, so callers can't modify the cached document
+        (including the nested analysis).
+        """
+        with self._recent_lock:
+            document = self._recent.get(analysis_id)
+            if document is not None:
+                self._recent.move_to_end(analysis_id)
+                return copy.deepcopy(document)
+        
+        db = self.db_manager.get_database()
         if not db:
             return None
         
-        return db.find_document_by_id(self.collection, analysis_id)
+        document = db.find_document_by_id(self.collection, analysis_id)
+        if document is None:
+            return None
+        with self._recent_lock:
+            self._recent[analysis_id] = document
+            self._recent.move_to_end(analysis_id)
+            if len(self._recent) > self.RECENT_CACHE_SIZE:
+                self._recent.popitem(last=False)
+        return copy.deepcopy(document)
     
     def get_job_analyses(self, limit: int = 20, company: str = None, 
-                        experience_level: str = None, skills: List[str] = None) -> List[Dict[str, Any]]:
-        """Get job analyses with optional filtering"""
-        db = db_manager.get_database()
+                        experience_level: str = None, skills: List[str] = None,
+                        after: Optional[Tuple[str, str]] = None,
+                        fields: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """Get job analyses with optional filtering, newest first
+        
+        Pass ``after=page_cursor(previous_page)`` to fetch the next page, and
+        ``fields`` to fetch only the parts of each analysis that will be shown.
+        """
+        db = self.db_manager.get_database()
         if not db:
             return []
         
@@ -64,7 +112,9 @@ class JobAnalysisStorage:
             self.collection, 
             query=query, 
             limit=limit * 2 if skills else limit,  # Get more if we need to filter by skills
-            sort_by='-created_at'
+            sort_by='-created_at',
+            after=after,
+            fields=None if skills else fields  # Skills filtering needs the full analysis
         )
         
         # Filter by skills if specified
@@ -92,50 +142,88 @@ class JobAnalysisStorage:
         """Get job analyses for a specific experience level"""
         return self.get_job_analyses(limit=limit, experience_level=experience_level)
     
-    def search_analyses(self, search_term: str, limit: int = 20) -> List[Dict[str, Any]]:
+    def search_analyses(self, search_term: str, limit: int = 20,
+                        after: Optional[Tuple[str, str]] = None,
+                        fields: Optional[List[str]] = None) -> List[Dict[str, Any]]:
         """Search job analyses by job title, company, or skills"""
-        db = db_manager.get_database()
+        db = self.db_manager.get_database()
         if not db:
             return []
         
-        # Get all analyses and filter in memory (simple implementation)
-        # For production, you'd want to implement proper text search
-        all_analyses = db.find_documents(self.collection, limit=100, sort_by='-created_at')
-        
-        search_term_lower = search_term.lower()
-        matching_analyses = []
-        
-        for analysis in all_analyses:
-            # Search in job title, company, and skills
-            searchable_text = ' '.join([
-                analysis.get('job_title', ''),
-                analysis.get('company', ''),
-                ' '.join(analysis.get('tags', [])),
-                ' '.join(self._get_all_skills(analysis.get('analysis', {})))
-            ]).lower()
-            
-            if search_term_lower in searchable_text:
-                matching_analyses.append(analysis)
-                if len(matching_analyses) >= limit:
-                    break
+        # MongoDB answers the search from its text index
+        if isinstance(db, MongoDatabase):
+            return db.find_documents(
+                self.collection,
+                query={'$text': {'$search': search_term}},
+                limit=limit,
+                sort_by='-created_at',
+                after=after,
+                fields=fields
+            )
+        
+        # Otherwise match against the precomputed lowercase search_blob in the query
+        if db not in self._search_blobs_checked:
+            self._backfill_search_blobs(db)
+        
+        return db.find_documents(
+            self.collection,
+            query={'search_blob': {'$contains': search_term.lower()}},
+            limit=limit,
+            sort_by='-created_at',
+            after=after,
+            fields=fields
+        )
+    
+    # Fields the Job History list renders for each analysis; the full job
+    # description is fetched separately, only when asked for
+    LIST_FIELDS = ['job_title', 'company', 'experience_level', 'skills_count',
+                   'analysis.technical_skills[:5]', 'job_description_preview',
+                   'job_description_length']
+    
+    @staticmethod
+    def page_cursor(analyses: List[Dict[str, Any]]) -> Optional[Tuple[str, str]]:
+        """Keyset cursor for the page after ``analyses`` (newest-first order)"""
+        if not analyses:
+            return None
+        last = analyses[-1]
+        return (last['created_at'], last['_id'])
+    
+    def autocomplete_companies(self, prefix: str = "", limit: int = 20) -> List[str]:
+        """Company names starting with prefix, for the Job History company filter"""
+        db = self.db_manager.get_database()
+        if not db:
+            return []
         
-        return matching_analyses
+        return [c for c in db.distinct_values(self.collection, 'company', prefix, limit) if c]
     
     def delete_job_analysis(self, analysis_id: str) -> bool:
         """Delete a job analysis"""
-        db = db_manager.get_database()
+        db = self.db_manager.get_database()
         if not db:
             return False
         
+        self._forget_recent([analysis_id])
         return db.delete_document(self.collection, analysis_id)
     
+    def delete_job_analyses(self, analysis_ids: List[str]) -> int:
+        """Delete several job analyses at once; returns how many were deleted"""
+        db = self.db_manager.get_database()
+        if not db:
+            return 0
+        
+        self._forget_recent(analysis_ids)
+        return db.delete_documents(self.collection, analysis_ids)
+    
     def get_analysis_stats(self) -> Dict[str, Any]:
         """Get statistics about stored job analyses"""
-        db = db_manager.get_database()
+        db = self.db_manager.get_database()
         if not db:
             return {}
         
         try:
+            if isinstance(db, MongoDatabase):
+                return self._aggregate_stats(db)
+            
             total_count = db.count_documents(self.collection)
             
             # Get recent analyses for stats
@@ -167,13 +255,92 @@ class JobAnalysisStorage:
                 'total_analyses': total_count,
                 'unique_companies': len(companies),
                 'experience_levels': experience_levels,
-                'top_skills': top_skills_list,
-                'companies': list(companies)[:20]  # Top 20 companies
+                'common_level': max(experience_levels, key=experience_levels.get) if experience_levels else None,
+                'top_skills': top_skills_list
             }
         except Exception as e:
             print(f"Error getting analysis stats: {e}")
             return {}
     
+    def get_stats_token(self) -> Tuple[int, Optional[str]]:
+        """Cheap fingerprint of the collection (count, newest created_at)
+        
+        Changes whenever an analysis is added or deleted, so callers can cache
+        get_analysis_stats() on it.
+        """
+        db = self.db_manager.get_database()
+        if not db:
+            return (0, None)
+        
+        newest = db.find_documents(self.collection, limit=1, sort_by='-created_at', fields=['created_at'])
+        return (db.count_documents(self.collection), newest[0]['created_at'] if newest else None)
+    
+    def _aggregate_stats(self, db: MongoDatabase) -> Dict[str, Any]:
+        """Compute the stats in a single $facet aggregation on the server"""
+        all_skills = {'$setUnion': [
+            {'$ifNull': ['$analysis.technical_skills', []]},
+            {'$ifNull': ['$analysis.soft_skills', []]},
+            {'$ifNull': ['$analysis.skills.technical', []]},
+            {'$ifNull': ['$analysis.skills.soft', []]}
+        ]}
+        result = db.aggregate(self.collection, [{'$facet': {
+            'total': [{'$count': 'n'}],
+            'companies': [
+                {'$match': {'company': {'$nin': [None, '']}}},
+                {'$group': {'_id': '$company'}},
+                {'$count': 'n'}
+            ],
+            'by_level': [
+                {'$group': {'_id': {'$ifNull': ['$experience_level', 'unknown']}, 'n': {'$sum': 1}}},
+                {'$sort': {'n': -1}}
+            ],
+            'top_skills': [
+                {'$project': {'skills': all_skills}},
+                {'$unwind': '$skills'},
+                {'$group': {'_id': '$skills', 'n': {'$sum': 1}}},
+                {'$sort': {'n': -1}},
+                {'$limit': 10}
+            ]
+        }}])[0]
+        
+        total = result['total']
+        companies = result['companies']
+        return {
+            'total_analyses': total[0]['n'] if total else 0,
+            'unique_companies': companies[0]['n'] if companies else 0,
+            'experience_levels': {row['_id']: row['n'] for row in result['by_level']},
+            # by_level is sorted by count, so the most common level comes first
+            'common_level': result['by_level'][0]['_id'] if result['by_level'] else None,
+            'top_skills': [(row['_id'], row['n']) for row in result['top_skills']]
+        }
+    
+    def clear_recent(self):
+        """Empty the recent-analysis cache, e.g. after switching databases"""
+        with self._recent_lock:
+            self._recent.clear()
+    
+    def _forget_recent(self, analysis_ids: List[str]):
+        """Evict analyses from the recent cache after they change or are deleted"""
+        with self._recent_lock:
+            for analysis_id in analysis_ids:
+                self._recent.pop(analysis_id, None)
+    
+    def _search_blob(self, document: Dict[str, Any]) -> str:
+        """Lowercase text searched by search_analyses: title, company, tags and skills"""
+        return ' '.join([
+            document.get('job_title') or '',
+            document.get('company') or '',
+            *document.get('tags', []),
+            *self._get_all_skills(document.get('analysis', {}))
+        ]).lower()
+    
+    def _backfill_search_blobs(self, db):
+        """Add search_blob to analyses saved before it existed (runs once per connection)"""
+        for document in db.find_documents(self.collection, query={'search_blob': None}):
+            db.update_document(self.collection, document['_id'], {'search_blob': self._search_blob(document)})
+            self._forget_recent([document['_id']])
+        self._search_blobs_checked.add(db)
+    
     def _extract_tags(self, analysis: Dict[str, Any]) -> List[str]:
         """Extract tags from analysis for easier searching"""
         tags = []
@@ -222,7 +389,4 @@ class JobAnalysisStorage:
                 if 'soft' in skill_data:
                     skills.extend(skill_data['soft'])
         
-        return list(set(skills))  # Remove duplicates
-
-# Global instance
-job_storage = JobAnalysisStorage()
\ No newline at end of file
+        return list(set(skills))  # Remove duplicates
\ No newline at end of file
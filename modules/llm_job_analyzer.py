@@ -47,8 +47,12 @@ class LLMJobAnalyzer:
             st.error(f"Error calling Pychomsky API: {str(e)}")
             raise e
     
-    def analyze_job_description(self, job_text: str) -> Dict:
-        """Use LLM to comprehensively analyze job description"""
+    def analyze_job_description(self, job_text: str, fallback: bool = True) -> Dict:
+        """Use LLM to comprehensively analyze job description
+        
+        With ``fallback=False`` errors are raised instead of returning the basic
+        fallback analysis, so callers that cache results can skip failures.
+        """
         
         system_prompt = """You are an expert HR analyst and resume writer. Analyze job descriptions and extract structured information to help tailor resumes effectively."""
         
@@ -110,15 +114,23 @@ class LLMJobAnalyzer:
             return analysis
             
         except json.JSONDecodeError as e:
+            if not fallback:
+                raise
             st.error(f"Error parsing LLM response as JSON: {str(e)}")
             # Fallback to basic analysis
             return self._fallback_analysis(job_text)
         except Exception as e:
+            if not fallback:
+                raise
             st.error(f"Error in job analysis: {str(e)}")
             return self._fallback_analysis(job_text)
     
-    def calculate_match_score(self, profile_skills: List[str], job_analysis: Dict) -> float:
-        """Use LLM to calculate intelligent match score between profile and job"""
+    def calculate_match_score(self, profile_skills: List[str], job_analysis: Dict, fallback: bool = True) -> float:
+        """Use LLM to calculate intelligent match score between profile and job
+        
+        With ``fallback=False`` errors are raised instead of returning the
+        simple overlap score, so callers that cache results can skip failures.
+        """
         
         if not profile_skills:
             return 0.0
@@ -166,6 +178,8 @@ class LLMJobAnalyzer:
             return match_data.get('match_score', 0.0)
             
         except Exception as e:
+            if not fallback:
+                raise
             st.warning(f"Error calculating LLM match score, using fallback: {str(e)}")
             return self._fallback_match_score(profile_skills, job_analysis)
     
@@ -248,8 +262,6 @@ class LLMJobAnalyzer:
         if not job_skills:
             return 0.0
         
-        profile_skills_lower = [skill.lower().strip() for skill in profile_skills]
-        job_skills_lower = [skill.lower().strip() for skill in job_skills]
-        
-        matching = len(set(profile_skills_lower) & set(job_skills_lower))
-        return (matching / len(job_skills_lower)) * 100
\ No newline at end of file
+        profile_skills_lower = {skill.lower().strip() for skill in profile_skills}
+        matching = len(profile_skills_lower.intersection(skill.lower().strip() for skill in job_skills))
+        return (matching / len(job_skills)) * 100
\ No newline at end of file
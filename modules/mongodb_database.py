@@ -1,7 +1,8 @@
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 from .database_interface import DatabaseInterface
 from datetime import datetime
 import os
+import re
 
 try:
     from pymongo import MongoClient
@@ -67,7 +68,9 @@ class MongoDatabase(DatabaseInterface):
             raise Exception(f"Failed to insert document: {e}")
     
     def find_documents(self, collection: str, query: Dict[str, Any] = None, 
-                      limit: Optional[int] = None, sort_by: Optional[str] = None) -> List[Dict[str, Any]]:
+                      limit: Optional[int] = None, sort_by: Optional[str] = None,
+                      after: Optional[Tuple[Any, str]] = None,
+                      fields: Optional[List[str]] = None) -> List[Dict[str, Any]]:
         """Find documents matching query"""
         if not self.database:
             raise Exception("Database not connected")
@@ -80,14 +83,34 @@ class MongoDatabase(DatabaseInterface):
                 if isinstance(query['_id'], str):
                     query['_id'] = ObjectId(query['_id'])
             
-            cursor = collection_obj.find(query or {})
+            # Keyset pagination: continue after the (sort value, _id) of the previous page
+            if sort_by and after:
+                sort_field = sort_by.lstrip('-')
+                op = '$lt' if sort_by.startswith('-') else '$gt'
+                after_value, after_id = after
+                if ObjectId.is_valid(after_id):
+                    after_id = ObjectId(after_id)
+                keyset = {'$or': [
+                    {sort_field: {op: after_value}},
+                    {sort_field: after_value, '_id': {op: after_id}}
+                ]}
+                query = {'$and': [query, keyset]} if query else keyset
             
-            # Apply sorting
+            projection = None
+            if fields:
+                projection = {'created_at': 1}
+                for field in fields:
+                    path, count = self.parse_field(field)
+                    projection[path] = 1 if count is None else {'$slice': count}
+            
+            cursor = collection_obj.find(query or {}, projection)
+            
+            # Apply sorting (_id breaks ties so pages are stable)
             if sort_by:
                 if sort_by.startswith('-'):
-                    cursor = cursor.sort(sort_by[1:], -1)  # Descending
+                    cursor = cursor.sort([(sort_by[1:], -1), ('_id', -1)])  # Descending
                 else:
-                    cursor = cursor.sort(sort_by, 1)  # Ascending
+                    cursor = cursor.sort([(sort_by, 1), ('_id', 1)])  # Ascending
             
             # Apply limit
             if limit:
@@ -163,6 +186,42 @@ class MongoDatabase(DatabaseInterface):
         except PyMongoError as e:
             raise Exception(f"Failed to delete document: {e}")
     
+    def delete_documents(self, collection: str, doc_ids: List[str]) -> int:
+        """Delete several documents by ID in one operation; returns how many were deleted"""
+        if not self.database:
+            raise Exception("Database not connected")
+        
+        if not doc_ids:
+            return 0
+        
+        try:
+            collection_obj = self.database[collection]
+            
+            # Convert string IDs to ObjectIds
+            object_ids = [ObjectId(doc_id) if ObjectId.is_valid(doc_id) else doc_id for doc_id in doc_ids]
+            
+            result = collection_obj.delete_many({"_id": {"$in": object_ids}})
+            return result.deleted_count
+        except PyMongoError as e:
+            raise Exception(f"Failed to delete documents: {e}")
+    
+    def distinct_values(self, collection: str, field: str, prefix: str = "",
+                        limit: int = 20) -> List[Any]:
+        """Distinct values of a field, optionally only those starting with prefix (case-insensitive)"""
+        if not self.database:
+            raise Exception("Database not connected")
+        
+        try:
+            pipeline = [
+                {"$match": {field: {"$regex": f"^{re.escape(prefix)}", "$options": "i"}}},
+                {"$group": {"_id": f"${field}"}},
+                {"$sort": {"_id": 1}},
+                {"$limit": limit}
+            ]
+            return [row["_id"] for row in self.database[collection].aggregate(pipeline)]
+        except PyMongoError as e:
+            raise Exception(f"Failed to get distinct values: {e}")
+    
     def count_documents(self, collection: str, query: Dict[str, Any] = None) -> int:
         """Count documents matching query"""
         if not self.database:
@@ -206,15 +265,30 @@ class MongoDatabase(DatabaseInterface):
         except PyMongoError as e:
             raise Exception(f"Failed to list collections: {e}")
     
+    def aggregate(self, collection: str, pipeline: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Run an aggregation pipeline and return the resulting documents"""
+        if not self.database:
+            raise Exception("Database not connected")
+        
+        try:
+            return list(self.database[collection].aggregate(pipeline))
+        except PyMongoError as e:
+            raise Exception(f"Failed to aggregate documents: {e}")
+    
     def create_indexes(self, collection: str, indexes: List[Dict[str, Any]]):
-        """Create indexes for better query performance"""
+        """Create indexes for better query performance
+        
+        Each index is either ``{"field": name, "order": 1|-1|"text"}`` or a
+        compound ``{"fields": [(name, order), ...]}``.
+        """
         if not self.database:
             raise Exception("Database not connected")
         
         try:
             collection_obj = self.database[collection]
             for index in indexes:
-                collection_obj.create_index([(index['field'], index.get('order', 1))])
+                fields = index.get('fields') or [(index['field'], index.get('order', 1))]
+                collection_obj.create_index(list(fields))
         except PyMongoError as e:
             print(f"Warning: Failed to create indexes: {e}")
     
@@ -11,6 +11,14 @@ from docx.shared import Inches, RGBColor
 from docx.enum.text import WD_ALIGN_PARAGRAPH
 import io
 
+# Skill categories as (resume heading, profile key), in display order
+SKILL_CATEGORIES = (
+    ('Programming', 'programming_skills'),
+    ('Technologies', 'technologies'),
+    ('Languages', 'language_skills'),
+    ('Certifications', 'certifications')
+)
+
 class ResumeGenerator:
     def __init__(self):
         self.styles = getSampleStyleSheet()
@@ -161,13 +169,14 @@ class ResumeGenerator:
         if not job_analysis:
             return experiences
         
-        # Get job keywords and skills
-        job_keywords = [kw[0].lower() for kw in job_analysis.get('keywords', [])]
-        job_skills = [skill.lower() for skill in 
-                     job_analysis.get('skills', {}).get('technical', []) + 
-                     job_analysis.get('skills', {}).get('soft', [])]
+        # Get job keywords and skills straight into one set
+        job_skills = job_analysis.get('skills', {})
+        all_job_terms = {kw[0].lower() for kw in job_analysis.get('keywords', [])}
+        all_job_terms.update(skill.lower() for skill in job_skills.get('technical', []))
+        all_job_terms.update(skill.lower() for skill in job_skills.get('soft', []))
         
-        all_job_terms = set(job_keywords + job_skills)
+        # Top 5 priority skills, looked up once rather than per experience
+        priority_skills = job_analysis.get('priority_skills', [])[:5]
         
         # Score each experience based on relevance
         scored_experiences = []
@@ -183,8 +192,7 @@ class ResumeGenerator:
                     score += 1
             
             # Boost score for priority skills
-            priority_skills = job_analysis.get('priority_skills', [])
-            for priority in priority_skills[:5]:  # Top 5 priority skills
+            for priority in priority_skills:
                 if isinstance(priority, dict):
                     skill_name = priority.get('skill', '')
                     if skill_name and skill_name.lower() in exp_text:
@@ -211,32 +219,32 @@ class ResumeGenerator:
         # In a more advanced version, this could use NLP to enhance descriptions
         return description
     
-    def get_all_skills_combined(self, profile: Dict) -> str:
-        """Combine all skill categories into a single string"""
+    def get_all_skills_list(self, profile: Dict) -> List[str]:
+        """Collect the skills from all categories as a list"""
         all_skills = []
         
-        # Collect skills from all categories
-        categories = ['programming_skills', 'technologies', 'language_skills', 'certifications']
-        for category in categories:
-            skills_text = profile.get(category, '')
+        # Collect skills from all categories, splitting and trimming in one pass
+        for _, key in SKILL_CATEGORIES:
+            skills_text = profile.get(key, '')
             if skills_text:
-                skills_list = [skill.strip() for skill in skills_text.split(',') if skill.strip()]
-                all_skills.extend(skills_list)
+                all_skills.extend(skill for skill in (s.strip() for s in skills_text.split(',')) if skill)
         
-        return ', '.join(all_skills)
+        return all_skills
+    
+    def get_all_skills_combined(self, profile: Dict) -> str:
+        """Combine all skill categories into a single string"""
+        return ', '.join(self.get_all_skills_list(profile))
     
     def generate_tailored_skills(self, profile: Dict, job_analysis: Dict) -> str:
         """Generate a tailored skills section based on job requirements"""
-        # Get all skills combined from categories
-        all_skills_text = self.get_all_skills_combined(profile)
+        # Get all skills from categories without a join/re-split round trip
+        profile_skill_list = self.get_all_skills_list(profile)
         
-        if not all_skills_text:
+        if not profile_skill_list:
             return ""
         
-        profile_skill_list = [skill.strip() for skill in all_skills_text.split(',')]
-        
         if not job_analysis:
-            return all_skills_text
+            return ', '.join(profile_skill_list)
         
         # Get job skills
         job_technical = job_analysis.get('skills', {}).get('technical', [])
@@ -251,14 +259,14 @@ class ResumeGenerator:
             else:
                 priority_skills.append(str(ps))
         
-        # Prioritize skills that match the job
+        # Prioritize skills that match the job (sets, so each check is a lookup)
+        job_skills_lower = frozenset(js.lower() for js in job_technical + job_soft)
+        priority_skills = frozenset(priority_skills)
         matched_skills = []
         unmatched_skills = []
         
         for skill in profile_skill_list:
-            skill_lower = skill.lower()
-            is_match = (skill_lower in [js.lower() for js in job_technical + job_soft] or
-                       skill in priority_skills)
+            is_match = skill.lower() in job_skills_lower or skill in priority_skills
             
             if is_match:
                 matched_skills.append(skill)
@@ -273,14 +281,8 @@ class ResumeGenerator:
         """Generate skills text organized by categories"""
         skills_sections = []
         
-        categories = {
-            'Programming': profile.get('programming_skills', ''),
-            'Technologies': profile.get('technologies', ''),
-            'Languages': profile.get('language_skills', ''),
-            'Certifications': profile.get('certifications', '')
-        }
-        
-        for category, skills_text in categories.items():
+        for category, key in SKILL_CATEGORIES:
+            skills_text = profile.get(key, '')
             if skills_text:
                 skills_sections.append(f"{category}: {skills_text}")
         
@@ -288,15 +290,12 @@ class ResumeGenerator:
     
     def generate_categorized_skills_for_pdf(self, profile: Dict) -> Dict[str, str]:
         """Generate skills organized by categories for PDF formatting"""
-        categories = {
-            'Programming': profile.get('programming_skills', ''),
-            'Technologies': profile.get('technologies', ''),
-            'Languages': profile.get('language_skills', ''),
-            'Certifications': profile.get('certifications', '')
-        }
-        
         # Return only categories that have content
-        return {category: skills for category, skills in categories.items() if skills.strip()}
+        return {
+            category: profile.get(key, '')
+            for category, key in SKILL_CATEGORIES
+            if profile.get(key, '').strip()
+        }
     
     def enhance_content_with_llm(self, content: str, content_type: str, job_analysis: Dict = None) -> str:
         """
@@ -407,7 +406,7 @@ class ResumeGenerator:
             if job_analysis:
                 # For tailored resumes, show most relevant categories first
                 job_skills = job_analysis.get('skills', {}).get('technical', []) + job_analysis.get('skills', {}).get('soft', [])
-                job_skills_lower = [skill.lower() for skill in job_skills]
+                job_skills_lower = frozenset(skill.lower() for skill in job_skills)
                 
                 # Score categories by relevance
                 category_scores = {}
@@ -732,4 +731,23 @@ class ResumeGenerator:
         buffer = io.BytesIO()
         doc.save(buffer)
         buffer.seek(0)
-        return buffer
\ No newline at end of file
+        return buffer
+
+
+_worker_generator = None
+
+def render_resume(profile: Dict, job_analysis: Dict = None, format_choice: str = "PDF") -> bytes:
+    """Render a resume document to bytes
+    
+    Module-level so it can run in a worker process; each process builds its
+    ResumeGenerator (and stylesheet) once and reuses it.
+    """
+    global _worker_generator
+    if _worker_generator is None:
+        _worker_generator = ResumeGenerator()
+    
+    if format_choice == "PDF":
+        buffer = _worker_generator.generate_pdf_resume(profile, job_analysis)
+    else:
+        buffer = _worker_generator.generate_word_resume(profile, job_analysis)
+    return buffer.getvalue()
\ No newline at end of file
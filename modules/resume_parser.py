@@ -1,6 +1,8 @@
 import PyPDF2
 import pdfplumber
 from docx import Document
+import io
+import os
 import re
 from typing import Dict, List, Optional
 
@@ -161,12 +163,22 @@ class ResumeParser:
     
     def parse_resume(self, file) -> Dict:
         """Main method to parse resume and extract all information"""
+        # Read the upload's bytes once and parse through the single bytes path
+        return self.parse_resume_bytes(file.getvalue(), file.name)
+    
+    def parse_resume_bytes(self, data: bytes, filename: str) -> Dict:
+        """Parse a resume from raw file bytes, using the filename's extension for the type
+        
+        The bytes are wrapped in a single BytesIO, so callers can pass
+        ``uploaded_file.getvalue()`` (which is also hashable for caching).
+        """
         try:
             # Determine file type and extract text
-            if file.type == "application/pdf":
-                text = self.extract_text_from_pdf(file)
-            elif file.type == "application/vnd.openxmlformats-officedocument.wordprocessingml.document":
-                text = self.extract_text_from_docx(file)
+            extension = os.path.splitext(filename)[1].lower()
+            if extension == ".pdf":
+                text = self.extract_text_from_pdf(io.BytesIO(data))
+            elif extension == ".docx":
+                text = self.extract_text_from_docx(io.BytesIO(data))
             else:
                 raise ValueError("Unsupported file type. Please upload PDF or DOCX files.")
             
@@ -1,5 +1,5 @@
 import streamlit as st
-from typing import Dict
+from typing import Dict, List
 
 class ResumePreview:
     def __init__(self):
@@ -12,8 +12,13 @@ class ResumePreview:
         return str(text).replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;').replace('"', '&quot;').replace("'", '&#x27;')
     
     
-    def display_preview(self, profile: Dict, job_analysis: Dict = None, generator=None):
-        """Display the resume preview in Streamlit"""
+    def display_preview(self, profile: Dict, job_analysis: Dict = None, generator=None,
+                        tailored_skills: str = None, prioritized_experiences: List[Dict] = None):
+        """Display the resume preview in Streamlit
+
+        Precomputed tailored_skills / prioritized_experiences are used as-is
+        instead of being regenerated from the job analysis.
+        """
         
         # Use a simpler approach - display sections separately
         st.markdown("### 👁️ Resume Preview")
@@ -86,8 +91,12 @@ class ResumePreview:
             # Professional Summary
             if generator and job_analysis:
                 summary = generator.generate_professional_summary(profile, job_analysis)
-                skills = generator.generate_tailored_skills(profile, job_analysis)
-                experiences = generator.prioritize_experiences(profile.get('experiences', []), job_analysis)
+                if tailored_skills is None:
+                    tailored_skills = generator.generate_tailored_skills(profile, job_analysis)
+                if prioritized_experiences is None:
+                    prioritized_experiences = generator.prioritize_experiences(profile.get('experiences', []), job_analysis)
+                skills = tailored_skills
+                experiences = prioritized_experiences
             else:
                 summary = profile.get('summary', '')
                 skills = generator.generate_categorized_skills_text(profile) if generator else ""
@@ -100,7 +109,7 @@ class ResumePreview:
             # Skills
             if skills:
                 st.markdown('<div class="preview-section-title">Skills</div>', unsafe_allow_html=True)
-                skills_list = [skill.strip() for skill in skills.split(',') if skill.strip()]
+                skills_list = [skill for skill in (s.strip() for s in skills.split(',')) if skill]
                 skills_cols = st.columns(3)
                 for i, skill in enumerate(skills_list):
                     with skills_cols[i % 3]:
@@ -158,7 +167,9 @@ class ResumePreview:
             else:
                 st.write("• This preview shows the standard version of your resume")
     
-    def show_comparison(self, profile: Dict, job_analysis: Dict, generator):
+    def show_comparison(self, profile: Dict, job_analysis: Dict, generator,
+                        original_skills: str = None, tailored_skills: str = None,
+                        prioritized_experiences: List[Dict] = None):
         """Show side-by-side comparison of standard vs tailored resume"""
         
         st.markdown("### 🔄 Standard vs Tailored Comparison")
@@ -167,10 +178,14 @@ class ResumePreview:
         st.markdown("#### 🔍 Key Differences")
         
         # Skills comparison
-        original_skills_str = generator.generate_categorized_skills_text(profile)
-        original_skills = [s.strip() for s in original_skills_str.split(',') if s.strip()]
-        tailored_skills_str = generator.generate_tailored_skills(profile, job_analysis)
-        tailored_skills = [s.strip() for s in tailored_skills_str.split(',') if s.strip()]
+        original_skills_str = original_skills
+        if original_skills_str is None:
+            original_skills_str = generator.generate_categorized_skills_text(profile)
+        original_skills = [skill for skill in (s.strip() for s in original_skills_str.split(',')) if skill]
+        tailored_skills_str = tailored_skills
+        if tailored_skills_str is None:
+            tailored_skills_str = generator.generate_tailored_skills(profile, job_analysis)
+        tailored_skills = [skill for skill in (s.strip() for s in tailored_skills_str.split(',')) if skill]
         
         col1, col2 = st.columns(2)
         
@@ -196,7 +211,9 @@ class ResumePreview:
                     st.write(f"• {skill}")
             
             # Tailored experience order
-            tailored_exp = generator.prioritize_experiences(original_exp, job_analysis)
+            tailored_exp = prioritized_experiences
+            if tailored_exp is None:
+                tailored_exp = generator.prioritize_experiences(original_exp, job_analysis)
             if tailored_exp:
                 st.write("**Experience (Prioritized by Relevance):**")
                 for i, exp in enumerate(tailored_exp[:3]):
@@ -1,7 +1,7 @@
 import sqlite3
 import json
 import uuid
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 from .database_interface import DatabaseInterface
 import os
 
@@ -41,6 +41,43 @@ class SQLiteDatabase(DatabaseInterface):
         ''')
         self.connection.commit()
     
+    @staticmethod
+    def _field_expr(field: str) -> str:
+        """SQL expression for a document field (metadata fields have their own columns)"""
+        if field == '_id':
+            return "id"
+        if field in ('created_at', 'updated_at'):
+            return field
+        # Same expression as the indexes built by create_indexes, so they get used
+        return f"json_extract(document, '$.{field}')"
+    
+    @staticmethod
+    def _like_escape(text: str) -> str:
+        """Escape LIKE wildcards so text is matched literally (use with ESCAPE '\\')"""
+        return text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    
+    def _query_conditions(self, query: Optional[Dict[str, Any]]) -> Tuple[List[str], List[Any]]:
+        """Translate a query dict into SQL conditions and parameters
+        
+        Values are matched for equality (None matches missing fields), except
+        ``{"$contains": text}`` which matches fields containing text. LIKE only
+        folds ASCII case, so match against text stored and passed in lowercase.
+        """
+        where_conditions = []
+        params = []
+        
+        for key, value in (query or {}).items():
+            if isinstance(value, dict) and '$contains' in value:
+                where_conditions.append(f"{self._field_expr(key)} LIKE ? ESCAPE '\\'")
+                params.append('%' + self._like_escape(value['$contains']) + '%')
+            elif value is None:
+                where_conditions.append(f"{self._field_expr(key)} IS NULL")
+            else:
+                where_conditions.append(f"{self._field_expr(key)} = ?")
+                params.append(value)
+        
+        return where_conditions, params
+    
     def insert_document(self, collection: str, document: Dict[str, Any]) -> str:
         """Insert a document and return its ID"""
         if not self.connection:
@@ -62,7 +99,9 @@ class SQLiteDatabase(DatabaseInterface):
         return doc_id
     
     def find_documents(self, collection: str, query: Dict[str, Any] = None, 
-                      limit: Optional[int] = None, sort_by: Optional[str] = None) -> List[Dict[str, Any]]:
+                      limit: Optional[int] = None, sort_by: Optional[str] = None,
+                      after: Optional[Tuple[Any, str]] = None,
+                      fields: Optional[List[str]] = None) -> List[Dict[str, Any]]:
         """Find documents matching query"""
         if not self.connection:
             raise Exception("Database not connected")
@@ -70,31 +109,40 @@ class SQLiteDatabase(DatabaseInterface):
         self._ensure_table_exists(collection)
         
         cursor = self.connection.cursor()
-        sql = f"SELECT document FROM {collection}"
+        if fields:
+            # Extract only the requested paths; with several paths json_extract
+            # returns them as one JSON array, so the full document is never decoded.
+            # Sliced arrays are extracted item by item.
+            paths = [self.parse_field(field) for field in dict.fromkeys(['_id', 'created_at', *fields])]
+            json_paths = []
+            for path, count in paths:
+                if count is None:
+                    json_paths.append(f"'$.{path}'")
+                else:
+                    json_paths.extend(f"'$.{path}[{i}]'" for i in range(count))
+            sql = f"SELECT json_extract(document, {', '.join(json_paths)}) AS document FROM {collection}"
+        else:
+            sql = f"SELECT document FROM {collection}"
         
         # Add WHERE clause if query provided
-        where_conditions = []
-        params = []
+        where_conditions, params = self._query_conditions(query)
         
-        if query:
-            for key, value in query.items():
-                if key == '_id':
-                    where_conditions.append("id = ?")
-                    params.append(value)
-                else:
-                    # For JSON fields, use JSON extract (SQLite 3.45+) or simple text search
-                    where_conditions.append(f"document LIKE ?")
-                    params.append(f'%"{key}":"{value}"%')
+        # Keyset pagination: continue after the (sort value, id) of the previous page
+        if sort_by and after:
+            sort_field = sort_by.lstrip('-')
+            op = '<' if sort_by.startswith('-') else '>'
+            where_conditions.append(f"({sort_field}, id) {op} (?, ?)")
+            params.extend(after)
         
         if where_conditions:
             sql += " WHERE " + " AND ".join(where_conditions)
         
-        # Add ORDER BY
+        # Add ORDER BY (id breaks ties so pages are stable)
         if sort_by:
             if sort_by.startswith('-'):
-                sql += f" ORDER BY {sort_by[1:]} DESC"
+                sql += f" ORDER BY {sort_by[1:]} DESC, id DESC"
             else:
-                sql += f" ORDER BY {sort_by} ASC"
+                sql += f" ORDER BY {sort_by} ASC, id ASC"
         
         # Add LIMIT
         if limit:
@@ -103,8 +151,30 @@ class SQLiteDatabase(DatabaseInterface):
         cursor.execute(sql, params)
         rows = cursor.fetchall()
         
+        if fields:
+            return [self._build_projection(paths, json.loads(row['document'])) for row in rows]
         return [json.loads(row['document']) for row in rows]
     
+    @staticmethod
+    def _build_projection(paths: List[Tuple[str, Optional[int]]], values: List[Any]) -> Dict[str, Any]:
+        """Rebuild a (nested) document from dotted paths and their extracted values"""
+        document = {}
+        values = iter(values)
+        for path, count in paths:
+            if count is None:
+                value = next(values)
+            else:
+                items = [next(values) for _ in range(count)]
+                value = [item for item in items if item is not None] or None
+            if value is None:
+                continue
+            *parents, leaf = path.split('.')
+            target = document
+            for parent in parents:
+                target = target.setdefault(parent, {})
+            target[leaf] = value
+        return document
+    
     def find_document_by_id(self, collection: str, doc_id: str) -> Optional[Dict[str, Any]]:
         """Find a single document by ID"""
         if not self.connection:
@@ -154,6 +224,39 @@ class SQLiteDatabase(DatabaseInterface):
         self.connection.commit()
         return cursor.rowcount > 0
     
+    def delete_documents(self, collection: str, doc_ids: List[str]) -> int:
+        """Delete several documents by ID in one operation; returns how many were deleted"""
+        if not self.connection:
+            raise Exception("Database not connected")
+        
+        if not doc_ids:
+            return 0
+        
+        cursor = self.connection.cursor()
+        placeholders = ", ".join("?" for _ in doc_ids)
+        cursor.execute(f"DELETE FROM {collection} WHERE id IN ({placeholders})", list(doc_ids))
+        self.connection.commit()
+        return cursor.rowcount
+    
+    def distinct_values(self, collection: str, field: str, prefix: str = "",
+                        limit: int = 20) -> List[Any]:
+        """Distinct values of a field, optionally only those starting with prefix (case-insensitive)"""
+        if not self.connection:
+            raise Exception("Database not connected")
+        
+        self._ensure_table_exists(collection)
+        
+        expr = self._field_expr(field)
+        pattern = self._like_escape(prefix) + '%'
+        cursor = self.connection.cursor()
+        cursor.execute(f'''
+            SELECT DISTINCT {expr} AS value FROM {collection}
+            WHERE {expr} LIKE ? ESCAPE '\\'
+            ORDER BY value
+            LIMIT ?
+        ''', (pattern, limit))
+        return [row['value'] for row in cursor.fetchall()]
+    
     def count_documents(self, collection: str, query: Dict[str, Any] = None) -> int:
         """Count documents matching query"""
         if not self.connection:
@@ -163,20 +266,10 @@ class SQLiteDatabase(DatabaseInterface):
         
         cursor = self.connection.cursor()
         sql = f"SELECT COUNT(*) FROM {collection}"
-        params = []
+        where_conditions, params = self._query_conditions(query)
         
-        if query:
-            where_conditions = []
-            for key, value in query.items():
-                if key == '_id':
-                    where_conditions.append("id = ?")
-                    params.append(value)
-                else:
-                    where_conditions.append(f"document LIKE ?")
-                    params.append(f'%"{key}":"{value}"%')
-            
-            if where_conditions:
-                sql += " WHERE " + " AND ".join(where_conditions)
+        if where_conditions:
+            sql += " WHERE " + " AND ".join(where_conditions)
         
         cursor.execute(sql, params)
         return cursor.fetchone()[0]
@@ -189,6 +282,32 @@ class SQLiteDatabase(DatabaseInterface):
         except Exception:
             return False
     
+    def create_indexes(self, collection: str, indexes: List[Dict[str, Any]]):
+        """Create indexes for better query performance
+        
+        Each index is either ``{"field": name, "order": 1|-1}`` or a compound
+        ``{"fields": [(name, order), ...]}``; document fields are indexed through
+        the same json_extract expression the queries use.
+        """
+        if not self.connection:
+            raise Exception("Database not connected")
+        
+        self._ensure_table_exists(collection)
+        
+        try:
+            cursor = self.connection.cursor()
+            for index in indexes:
+                fields = index.get('fields') or [(index['field'], index.get('order', 1))]
+                name = f"idx_{collection}_" + "_".join(field.replace('.', '_') for field, _ in fields)
+                columns = ", ".join(
+                    f"{self._field_expr(field)} {'DESC' if order == -1 else 'ASC'}"
+                    for field, order in fields
+                )
+                cursor.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {collection} ({columns})")
+            self.connection.commit()
+        except sqlite3.Error as e:
+            print(f"Warning: Failed to create indexes: {e}")
+    
     def list_collections(self) -> List[str]:
         """List all collections/tables"""
         if not self.connection: